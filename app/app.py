@@ -1,41 +1,179 @@
+import time
+
+# Início do rerun: o Streamlit reexecuta este arquivo a cada interação do usuário
+inicio_rerun = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import date
-from sqlalchemy import create_engine
 import os
+import statistics
+import sys
 from dotenv import load_dotenv
 import streamlit_authenticator as stauth
 import yaml
 from yaml.loader import SafeLoader
 
-# Carregar variáveis do arquivo .env
-load_dotenv()
+# Incluído uma única vez, e não a cada rerun
+caminho_src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+if caminho_src not in sys.path:
+    sys.path.append(caminho_src)
+
+from analises import Analises
+from cache_dados import cache_resumos, cache_titulos
+from consultas import criar_engine
+from fluxo_caixa import FluxoDeCaixa
+from graficos import GRANULARIDADES, cache_figuras
+from instrumentacao import ativa, coletar, etapa, resumir
+from projecao import cenarios_simulacao
+from snapshots import DIRETORIO_SNAPSHOTS
+
+
+@st.cache_resource
+def carregar_configuracao():
+    """
+    Lê o .env, as variáveis de ambiente e o config.yaml uma única vez por processo.
+    """
+    load_dotenv()
+    usuario = os.getenv("DB_USER")
+    senha = os.getenv("DB_PASS")
+    host = os.getenv("DB_HOST")
+    porta = os.getenv("DB_PORT")
+    db = os.getenv("DB_NAME")
+
+    config_path = os.path.join(os.path.dirname(__file__), 'config.yaml')
+    with open(config_path) as file:
+        autenticacao = yaml.load(file, Loader=SafeLoader)
+
+    return {
+        'db_url': f'postgresql+psycopg2://{usuario}:{senha}@{host}:{porta}/{db}',
+        'pool_size': int(os.getenv("DB_POOL_SIZE", 5)),
+        'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", 5)),
+        # Fonte dos dados: 'banco' (PostgreSQL) ou 'parquet' (snapshots gerados pelo ETL, sem banco)
+        'fonte_dados': os.getenv("FONTE_DADOS", "banco"),
+        'diretorio_snapshots': os.getenv("SNAPSHOT_DIR", DIRETORIO_SNAPSHOTS),
+        # Tempo máximo esperado de um rerun (interações que não consultam dados)
+        'orcamento_rerun_ms': float(os.getenv("ORCAMENTO_RERUN_MS", 50)),
+        'autenticacao': autenticacao,
+    }
 
-# Variáveis de ambiente
-usuario = os.getenv("DB_USER")
-senha = os.getenv("DB_PASS")
-host = os.getenv("DB_HOST")
-porta = os.getenv("DB_PORT")
-db = os.getenv("DB_NAME")
 
-# Criação da engine de conexão
-engine = create_engine(f'postgresql+psycopg2://{usuario}:{senha}@{host}:{porta}/{db}', connect_args={"options": "-c client_encoding=utf8"})
+@st.cache_resource
+def obter_engine(db_url, pool_size, max_overflow):
+    """
+    Engine com o pool de conexões, criada uma vez e compartilhada por todas as sessões.
+    """
+    return criar_engine(
+        db_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args={"options": "-c client_encoding=utf8"},
+    )
+
+
+@st.cache_resource
+def obter_analises(_engine):
+    """
+    Análises no banco com o cache de resultados por versão dos dados, compartilhado por todas as sessões.
+    """
+    return Analises(_engine)
+
+
+def obter_autenticador(autenticacao):
+    """
+    Autenticador da sessão, criado no primeiro rerun e reaproveitado nos seguintes.
+    Não é compartilhado entre sessões como a engine: o stauth.Authenticate guarda o estado do
+    cookie do navegador (token lido e gravado no login/logout), que é de cada usuário.
+    """
+    if 'autenticador' not in st.session_state:
+        st.session_state['autenticador'] = stauth.Authenticate(
+            autenticacao['credentials'],
+            autenticacao['cookie']['name'],
+            autenticacao['cookie']['key'],
+            autenticacao['cookie']['expiry_days']
+        )
+    return st.session_state['autenticador']
+
+
+def mostrar_latencia(orcamento_ms):
+    # Duração deste rerun e mediana dos últimos da sessão, comparadas ao orçamento
+    milissegundos = (time.perf_counter() - inicio_rerun) * 1000
+    historico = st.session_state.setdefault('latencias_rerun', [])
+    historico.append(milissegundos)
+    del historico[:-50]
+    texto = f"Rerun: {milissegundos:.0f} ms (mediana {statistics.median(historico):.0f} ms em {len(historico)})"
+    if milissegundos > orcamento_ms:
+        st.sidebar.warning(f"{texto}, acima do orçamento de {orcamento_ms:.0f} ms")
+    else:
+        st.sidebar.caption(texto)
 
-# Carregar o arquivo de configuração
-config_path = os.path.join(os.path.dirname(__file__), 'config.yaml')
-with open(config_path) as file:
-    config = yaml.load(file, Loader=SafeLoader)
 
-# Inicializar o autenticador
-authenticator = stauth.Authenticate(
-    config['credentials'],
-    config['cookie']['name'],
-    config['cookie']['key'],
-    config['cookie']['expiry_days']
-)
+# Conteúdo da página
+def executar(engine, config):
+    st.title("Dashboard de Fluxo de Caixa")
+    fluxo_caixa = FluxoDeCaixa(
+        engine,
+        config['diretorio_snapshots'] if config['fonte_dados'] == "parquet" else None,
+        obter_analises(engine) if engine is not None else None,
+    )
+
+    # Input do saldo inicial
+    saldo_inicial_input = st.sidebar.text_input("Saldo inicial em conta bancária (ex: R$ 195.584,85):")
+    saldo_inicial = fluxo_caixa.converter_para_float(saldo_inicial_input)
+
+    if saldo_inicial is not None:
+        fluxo_caixa.saldo_inicial = saldo_inicial
+
+        # Intervalo de datas
+        start_date, end_date = st.sidebar.date_input("Intervalo de Data", (date(2024, 9, 1), date(2024, 10, 31)), key="intervalo")
+        fluxo_caixa.carregar_dados(start_date, end_date)
+        fluxo_caixa.carregar_resumo(start_date, end_date)
+
+        # Cenários de simulação para a projeção do saldo
+        with st.sidebar.expander("Simulação de cenários"):
+            atraso = st.number_input("Atraso nos recebimentos (dias)", min_value=0, max_value=365, value=15)
+            desconto = st.number_input("Perda nos recebimentos (%)", min_value=0.0, max_value=100.0, value=10.0)
+        fluxo_caixa.calcular_fluxo(cenarios_simulacao(atraso, desconto))
+
+        # Estatísticas do cache compartilhado, para dimensionamento
+        with st.sidebar.expander("Cache de dados"):
+            st.json(cache_titulos.estatisticas())
+            st.json(cache_resumos.estatisticas())
+            st.json(cache_figuras.estatisticas())
+
+        # Mostrando dados
+        st.markdown("## Visão Geral")
+        fluxo_caixa.mostrar_dados()
+        st.markdown("---")
+        st.markdown("## Análises Visuais")
+        granularidade = st.radio("Agrupar por", list(GRANULARIDADES), index=1, horizontal=True, key="granularidade")
+        fluxo_caixa.gerar_graficos(start_date, end_date, GRANULARIDADES[granularidade])
+        st.markdown("## Projeção do Saldo")
+        fluxo_caixa.mostrar_projecao()
+        st.markdown("## Análises de Negócio")
+        fluxo_caixa.mostrar_analises(start_date, end_date)
+
+
+def main(engine, config):
+    # Com INSTRUMENTACAO=tempo|memoria, mede cada etapa do rerun e mostra o painel na barra lateral
+    with coletar() as registros, etapa('rerun'):
+        executar(engine, config)
+    if ativa():
+        with st.sidebar.expander("Desempenho da página"):
+            st.text(resumir(registros))
+            st.dataframe(pd.DataFrame(registros).drop(columns=['inicio']))
+
+
+st.set_page_config(page_title="Dashboard de Fluxo de Caixa", layout="wide")
+
+# Recursos do processo: configuração e engine (não usada no modo offline)
+config = carregar_configuracao()
+engine = None
+if config['fonte_dados'] != "parquet":
+    engine = obter_engine(config['db_url'], config['pool_size'], config['max_overflow'])
 
 # Autenticação
+authenticator = obter_autenticador(config['autenticacao'])
 st.title("Sistema de Autenticação")
 result = authenticator.login(location="main")
 
@@ -44,118 +182,10 @@ if result is not None:
     name, authentication_status, username = result
     if authentication_status:
         st.success(f"Bem-vindo, {name}!")
-        
-        # Classe FluxoDeCaixa
-        class FluxoDeCaixa:
-            def __init__(self, engine):
-                self.saldo_inicial = 0.0
-                self.df_pagar = pd.DataFrame()
-                self.df_receber = pd.DataFrame()
-                self.engine = engine
-
-            @staticmethod
-            def converter_para_float(valor):
-                try:
-                    valor = valor.replace("R$", "").replace(".", "").replace(",", ".")
-                    return float(valor)
-                except (ValueError, AttributeError):
-                    return None
-
-            def carregar_dados(self, start_date, end_date):
-                query_template = """
-                SELECT 
-                    f.no_titulo AS "No_Titulo", 
-                    f.parcela AS "Parcela", 
-                    f.tipo AS "Tipo", 
-                    {entidade} AS "Entidade",
-                    f.valor AS "Vlr_Titulo", 
-                    f.data_emissao::date AS "Data_Emissao", 
-                    f.data_vencimento AS "Data_Vencimento", 
-                    f.data_vencimento_real AS "Data_Vencimento_Real"
-                FROM 
-                    {tabela} AS f
-                LEFT JOIN 
-                    {dimensao} AS d ON f.{dim_id} = d.{dim_id}
-                WHERE 
-                    f.data_emissao BETWEEN '{start_date}' AND '{end_date}'
-                """
-                query_pagar = query_template.format(
-                    entidade="d.nome_fornec AS 'Fornecedor'",
-                    tabela="cashflow_financeiro.fato_apagar",
-                    dimensao="cashflow_financeiro.dim_fornecedor",
-                    dim_id="fornecedorID",
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                query_receber = query_template.format(
-                    entidade="c.nome_cliente AS 'Cliente'",
-                    tabela="cashflow_financeiro.fato_areceber",
-                    dimensao="cashflow_financeiro.dim_cliente",
-                    dim_id="clienteID",
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                # Carregar dados com uma conexão reutilizável
-                with self.engine.connect() as conn:
-                    self.df_pagar = pd.read_sql(query_pagar, conn)
-                    self.df_receber = pd.read_sql(query_receber, conn)
-
-                # Convertendo colunas de data
-                self.df_pagar['Data_Emissao'] = pd.to_datetime(self.df_pagar['Data_Emissao'], errors='coerce')
-                self.df_receber['Data_Emissao'] = pd.to_datetime(self.df_receber['Data_Emissao'], errors='coerce')
-
-            def mostrar_dados(self):
-                total_receber = self.df_receber['Vlr_Titulo'].sum()
-                total_pagar = self.df_pagar['Vlr_Titulo'].sum()
-                saldo_final = self.saldo_inicial + total_receber - total_pagar
-                col1, col2, col3 = st.columns(3)
-                col1.metric("Total a Receber", f"R$ {total_receber:,.2f}")
-                col2.metric("Total a Pagar", f"R$ {total_pagar:,.2f}")
-                col3.metric("Saldo Final", f"R$ {saldo_final:,.2f}")
-                st.write("### Dados de Contas a Pagar")
-                st.dataframe(self.df_pagar)
-                st.write("### Dados de Contas a Receber")
-                st.dataframe(self.df_receber)
-
-            def gerar_graficos(self, start_date, end_date):
-                self.df_pagar['Categoria'] = 'A Pagar'
-                self.df_receber['Categoria'] = 'A Receber'
-                df_combined = pd.concat([self.df_pagar, self.df_receber], ignore_index=True)
-                df_combined['Data_Emissao'] = pd.to_datetime(df_combined['Data_Emissao'])
-                df_filtered = df_combined[(df_combined['Data_Emissao'] >= start_date) & (df_combined['Data_Emissao'] <= end_date)]
-                df_grouped = df_filtered.groupby([df_filtered['Data_Emissao'].dt.to_period('W').apply(lambda r: r.start_time), 'Categoria']).agg({'Vlr_Titulo': 'sum'}).reset_index()
-                fig_barras = px.bar(df_grouped, x='Data_Emissao', y='Vlr_Titulo', color='Categoria', barmode='group', template='plotly_white')
-                fig_pizza = px.pie(df_combined, names='Categoria', values='Vlr_Titulo', template='plotly_white')
-                st.plotly_chart(fig_barras, use_container_width=True)
-                st.plotly_chart(fig_pizza, use_container_width=True)
-
-        # Função principal
-        def main():
-            st.set_page_config(page_title="Dashboard de Fluxo de Caixa", layout="wide")
-            st.title("Dashboard de Fluxo de Caixa")
-            fluxo_caixa = FluxoDeCaixa(engine)
-            
-            # Input do saldo inicial
-            saldo_inicial_input = st.sidebar.text_input("Saldo inicial em conta bancária (ex: R$ 195.584,85):")
-            saldo_inicial = fluxo_caixa.converter_para_float(saldo_inicial_input)
-            
-            if saldo_inicial is not None:
-                fluxo_caixa.saldo_inicial = saldo_inicial
-                
-                # Intervalo de datas
-                start_date, end_date = st.sidebar.date_input("Intervalo de Data", (date(2024, 9, 1), date(2024, 10, 31)), key="intervalo")
-                fluxo_caixa.carregar_dados(start_date, end_date)
-                
-                # Mostrando dados
-                st.markdown("## Visão Geral")
-                fluxo_caixa.mostrar_dados()
-                st.markdown("---")
-                st.markdown("## Análises Visuais")
-                fluxo_caixa.gerar_graficos(start_date, end_date)
-
-        main()
-
+        main(engine, config)
     else:
         st.error("Usuário ou senha incorretos")
 else:
     st.warning("Por favor, insira seu nome de usuário e senha")
+
+mostrar_latencia(config['orcamento_rerun_ms'])
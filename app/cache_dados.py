@@ -0,0 +1,156 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class CacheIntervalos:
+    """
+    Cache dos títulos (DataFrame compacto de titulos.py) por intervalo de datas, compartilhado
+    por todas as sessões do processo do Streamlit.
+
+    - Cada entrada expira após `ttl_segundos`; o cache guarda no máximo `max_entradas`
+      intervalos e `max_linhas` linhas, descartando os menos usados.
+    - Um intervalo contido em outro já carregado é respondido recortando o maior; o recorte vira
+      uma entrada própria, com a versão e a validade do maior, e não é refeito a cada rerun.
+    - Cada carga recebe uma versão, gravada com o intervalo em `attrs['chave_cache']` do
+      DataFrame entregue: (inicio, fim, versão) identifica os dados para caches derivados.
+    - Pedidos idênticos simultâneos de sessões diferentes esperam uma única consulta ao banco.
+    - As sessões recebem o mesmo DataFrame, sem cópia dos dados: só o leem.
+    """
+
+    def __init__(self, ttl_segundos=300, max_entradas=32, max_linhas=2_000_000, coluna_data='Data_Emissao'):
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self.max_linhas = max_linhas
+        self.coluna_data = coluna_data
+        self._entradas = OrderedDict()
+        self._em_andamento = {}
+        self._versoes = itertools.count(1)
+        self._lock = threading.Lock()
+        self._contadores = {
+            'acertos': 0,
+            'recortes': 0,
+            'falhas': 0,
+            'agrupados': 0,
+            'expirados': 0,
+            'descartados': 0,
+        }
+
+    def obter(self, inicio, fim, carregar):
+        """
+        Retorna os títulos do intervalo [inicio, fim], chamando `carregar(inicio, fim)`
+        apenas quando nenhuma entrada do cache atende o pedido.
+        """
+        chave = (inicio, fim)
+        while True:
+            with self._lock:
+                self._remover_expiradas()
+                if chave in self._entradas:
+                    self._contadores['acertos'] += 1
+                    self._entradas.move_to_end(chave)
+                    return self._copiar(self._entradas[chave]['dados'])
+
+                cobertura = self._buscar_cobertura(inicio, fim)
+                if cobertura is not None:
+                    self._contadores['recortes'] += 1
+                    self._entradas.move_to_end(cobertura)
+                    entrada = self._entradas[cobertura]
+                    recorte = self._recortar(entrada['dados'], inicio, fim)
+                    self._guardar(chave, recorte, entrada['versao'], entrada['criado_em'])
+                    return self._copiar(recorte)
+
+                evento = self._em_andamento.get(chave)
+                if evento is None:
+                    evento = threading.Event()
+                    self._em_andamento[chave] = evento
+                    self._contadores['falhas'] += 1
+                    break
+                self._contadores['agrupados'] += 1
+
+            # Outra sessão já está consultando o mesmo intervalo: aguarda e tenta de novo
+            evento.wait()
+
+        try:
+            dados = carregar(inicio, fim)
+            with self._lock:
+                self._guardar(chave, dados, next(self._versoes), time.monotonic())
+            return self._copiar(dados)
+        finally:
+            with self._lock:
+                self._em_andamento.pop(chave, None)
+            evento.set()
+
+    def estatisticas(self):
+        """
+        Contadores de uso e ocupação atual do cache.
+        """
+        with self._lock:
+            total = self._contadores['acertos'] + self._contadores['recortes'] + self._contadores['falhas']
+            return {
+                **self._contadores,
+                'taxa_acerto': (total - self._contadores['falhas']) / total if total else 0.0,
+                'entradas': len(self._entradas),
+                'linhas': sum(entrada['linhas'] for entrada in self._entradas.values()),
+                'megabytes': sum(entrada['bytes'] for entrada in self._entradas.values()) / 1024 ** 2,
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def _guardar(self, chave, dados, versao, criado_em):
+        # Texto e inteiro: os attrs seguem nas páginas serializadas em Arrow pelo st.dataframe
+        dados.attrs['chave_cache'] = (str(chave[0]), str(chave[1]), versao)
+        linhas = len(dados)
+        if linhas > self.max_linhas:
+            return
+        self._entradas[chave] = {
+            'dados': dados,
+            'linhas': linhas,
+            'bytes': int(dados.memory_usage(deep=True).sum()),
+            'versao': versao,
+            'criado_em': criado_em,
+        }
+        self._entradas.move_to_end(chave)
+        while (
+            len(self._entradas) > self.max_entradas
+            or sum(entrada['linhas'] for entrada in self._entradas.values()) > self.max_linhas
+        ):
+            self._entradas.popitem(last=False)
+            self._contadores['descartados'] += 1
+
+    def _remover_expiradas(self):
+        limite = time.monotonic() - self.ttl_segundos
+        for chave in [c for c, entrada in self._entradas.items() if entrada['criado_em'] < limite]:
+            del self._entradas[chave]
+            self._contadores['expirados'] += 1
+
+    def _buscar_cobertura(self, inicio, fim):
+        """
+        Procura o menor intervalo em cache que contém [inicio, fim].
+        """
+        candidatas = [
+            chave for chave in self._entradas
+            if chave[0] <= inicio and chave[1] >= fim
+        ]
+        if not candidatas:
+            return None
+        return min(candidatas, key=lambda chave: self._entradas[chave]['linhas'])
+
+    def _recortar(self, dados, inicio, fim):
+        # O filtro mantém a ordem das linhas (títulos a pagar primeiro)
+        datas = dados[self.coluna_data]
+        return dados[(datas >= pd.Timestamp(inicio)) & (datas <= pd.Timestamp(fim))]
+
+    @staticmethod
+    def _copiar(dados):
+        # Cópia rasa: um objeto por sessão sobre os mesmos dados (nada é copiado a cada rerun)
+        return dados.copy(deep=False)
+
+
+# Instâncias únicas por processo, compartilhadas entre as sessões: títulos e resumo diário
+cache_titulos = CacheIntervalos()
+cache_resumos = CacheIntervalos(coluna_data='Periodo')
@@ -0,0 +1,178 @@
+import contextvars
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from sqlalchemy import Date, bindparam, create_engine, event, inspect, text
+
+from instrumentacao import etapa
+
+# Consultas dos títulos por intervalo de emissão, com parâmetros vinculados
+SQL_PAGAR = """
+    SELECT
+        f.no_titulo AS "No_Titulo",
+        f.parcela AS "Parcela",
+        f.tipo AS "Tipo",
+        d.nome_fornec AS "Fornecedor",
+        f.valor AS "Vlr_Titulo",
+        f.data_emissao AS "Data_Emissao",
+        f.data_vencimento AS "Data_Vencimento",
+        f.data_vencimento_real AS "Data_Vencimento_Real"
+    FROM
+        cashflow_financeiro.fato_apagar AS f
+    LEFT JOIN
+        cashflow_financeiro.dim_fornecedor AS d ON f.fornecedorID = d.fornecedorID
+    WHERE
+        f.data_emissao BETWEEN {inicio} AND {fim}
+"""
+SQL_RECEBER = """
+    SELECT
+        f.no_titulo AS "No_Titulo",
+        f.parcela AS "Parcela",
+        f.tipo AS "Tipo",
+        c.nome_cliente AS "Cliente",
+        l.descricao AS "Loja",
+        f.lojaid AS "Loja_Id",
+        n.descricao AS "Natureza",
+        f.valor AS "Vlr_Titulo",
+        f.data_emissao AS "Data_Emissao",
+        f.data_vencimento AS "Data_Vencimento",
+        f.data_vencimento_real AS "Data_Vencimento_Real"
+    FROM
+        cashflow_financeiro.fato_areceber AS f
+    LEFT JOIN
+        cashflow_financeiro.dim_cliente AS c ON f.clienteID = c.clienteID
+    LEFT JOIN
+        cashflow_financeiro.dim_loja AS l ON f.lojaid = l.lojaid
+    LEFT JOIN
+        cashflow_financeiro.dim_natureza AS n ON f.naturezaID = n.naturezaID
+    WHERE
+        f.data_emissao BETWEEN {inicio} AND {fim}
+"""
+
+# Totais diários por categoria mantidos pelo ETL (src/resumos.py)
+SQL_RESUMO = """
+    SELECT
+        periodo AS "Periodo",
+        categoria AS "Categoria",
+        valor AS "Vlr_Titulo",
+        quantidade AS "Quantidade"
+    FROM
+        cashflow_financeiro.resumo_fluxo
+    WHERE
+        granularidade = 'dia'
+        AND base_data = :base_data
+        AND periodo BETWEEN :inicio AND :fim
+"""
+
+# Nome do prepared statement de cada consulta no PostgreSQL
+CONSULTAS = {
+    'titulos_pagar': SQL_PAGAR,
+    'titulos_receber': SQL_RECEBER,
+}
+
+COLUNAS_DATA = ['Data_Emissao', 'Data_Vencimento', 'Data_Vencimento_Real']
+
+# Executor das consultas paralelas de cada engine, com uma thread por conexão do pool
+# (pool_size + max_overflow): o limite de consultas simultâneas do servidor é o do pool
+_executores = weakref.WeakKeyDictionary()
+_trava_executores = threading.Lock()
+
+# Threads por carga (pagar e receber), usadas em engines criadas fora de criar_engine
+CONSULTAS_POR_CARGA = 2
+
+
+def _preparar_consultas(dbapi_conn, connection_record):
+    """
+    Prepara as consultas uma vez por conexão do pool (PostgreSQL).
+    """
+    cursor = dbapi_conn.cursor()
+    for nome, sql in CONSULTAS.items():
+        cursor.execute(f"PREPARE {nome}(date, date) AS {sql.format(inicio='$1', fim='$2')}")
+    cursor.close()
+    dbapi_conn.commit()
+
+
+def criar_engine(url, pool_size=5, max_overflow=5, **kwargs):
+    """
+    Cria a engine com um pool de conexões de tamanho explícito. No PostgreSQL
+    cada conexão nova já nasce com as consultas do dashboard preparadas.
+    """
+    engine = create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        **kwargs,
+    )
+    if engine.dialect.name == 'postgresql':
+        event.listen(engine, 'connect', _preparar_consultas)
+    with _trava_executores:
+        _executores[engine] = ThreadPoolExecutor(
+            max_workers=max(CONSULTAS_POR_CARGA, pool_size + max(max_overflow, 0)),
+            thread_name_prefix='consultas',
+        )
+    return engine
+
+
+def _executor(engine):
+    with _trava_executores:
+        if engine not in _executores:
+            _executores[engine] = ThreadPoolExecutor(max_workers=CONSULTAS_POR_CARGA, thread_name_prefix='consultas')
+        return _executores[engine]
+
+
+def _consulta(engine, nome):
+    """
+    Monta o comando da consulta: EXECUTE do prepared statement no PostgreSQL
+    ou o SQL parametrizado nos demais bancos.
+    """
+    if engine.dialect.name == 'postgresql':
+        sql = f"EXECUTE {nome}(:inicio, :fim)"
+    else:
+        sql = CONSULTAS[nome].format(inicio=':inicio', fim=':fim')
+    return text(sql).bindparams(bindparam('inicio', type_=Date), bindparam('fim', type_=Date))
+
+
+def consultar(engine, nome, inicio, fim):
+    """
+    Executa uma consulta em uma conexão própria do pool e converte as colunas de data.
+    """
+    with etapa('consulta_sql', consulta=nome) as registro, engine.connect() as conn:
+        df = pd.read_sql(_consulta(engine, nome), conn, params={'inicio': inicio, 'fim': fim})
+        registro['linhas'] = len(df)
+    with etapa('converter_datas', consulta=nome, linhas=len(df)):
+        for coluna in COLUNAS_DATA:
+            df[coluna] = pd.to_datetime(df[coluna], errors='coerce')
+    return df
+
+
+def carregar_titulos(engine, inicio, fim):
+    """
+    Carrega os títulos a pagar e a receber do intervalo, com as duas consultas em paralelo.
+    O tempo total fica limitado pela consulta mais lenta, não pela soma das duas.
+    """
+    # Cada thread roda em uma cópia do contexto da sessão, para que as etapas medidas cheguem ao painel
+    executor = _executor(engine)
+    futuro_pagar = executor.submit(contextvars.copy_context().run, consultar, engine, 'titulos_pagar', inicio, fim)
+    futuro_receber = executor.submit(contextvars.copy_context().run, consultar, engine, 'titulos_receber', inicio, fim)
+    return futuro_pagar.result(), futuro_receber.result()
+
+
+def carregar_resumo(engine, inicio, fim, base_data='emissao'):
+    """
+    Carrega os totais diários por categoria do intervalo a partir da tabela de resumo.
+    O volume lido depende do número de dias, não do número de títulos.
+    Retorna None se a tabela não existe (resumos ainda não gerados, ou descartados pelo
+    query-inserts.sql até a execução de src/resumos.py).
+    """
+    consulta = text(SQL_RESUMO).bindparams(bindparam('inicio', type_=Date), bindparam('fim', type_=Date))
+    with etapa('consulta_sql', consulta='resumo') as registro, engine.connect() as conn:
+        if not inspect(conn).has_table('resumo_fluxo', schema='cashflow_financeiro'):
+            return None
+        resumo = pd.read_sql(consulta, conn, params={'inicio': inicio, 'fim': fim, 'base_data': base_data})
+        registro['linhas'] = len(resumo)
+    resumo['Periodo'] = pd.to_datetime(resumo['Periodo'])
+    return resumo
@@ -0,0 +1,170 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from cache_dados import cache_resumos, cache_titulos
+from consultas import carregar_resumo, carregar_titulos
+from conversores import moeda_para_float
+from graficos import cache_figuras, montar_figuras, versao_resumo
+from indicadores import metricas, resumo_dos_titulos
+from instrumentacao import etapa
+from projecao import CENARIO_BASE, projetar_saldo
+from resumos import ORIGENS
+from snapshots import carregar_titulos_snapshot
+from tabela_paginada import ORDENACOES, TAMANHOS_PAGINA, TabelaPaginada
+from titulos import compactar_titulos, separar_titulos
+
+
+class FluxoDeCaixa:
+    """
+    Dados e visualizações do dashboard para uma sessão. Definida uma única vez por processo
+    (módulo importado), e não a cada rerun do app.py.
+    """
+
+    def __init__(self, engine, snapshots=None, analises=None):
+        self.saldo_inicial = 0.0
+        self.titulos = pd.DataFrame()
+        self.df_pagar = pd.DataFrame()
+        self.df_receber = pd.DataFrame()
+        self.resumo = pd.DataFrame()
+        self.projecao = None
+        self.engine = engine
+        self.snapshots = snapshots
+        self.analises = analises
+
+    @staticmethod
+    def converter_para_float(valor):
+        # Mesma conversão pt-BR usada pelo ETL (conversores.py); None se o valor for inválido
+        return moeda_para_float(valor)
+
+    def carregar_dados(self, start_date, end_date):
+        # Dados compartilhados entre sessões; só consulta o banco se o intervalo não estiver em cache.
+        # df_pagar e df_receber são fatias do DataFrame compacto, sem cópia
+        with etapa('carregar_dados') as registro:
+            self.titulos = cache_titulos.obter(start_date, end_date, self.consultar_dados)
+            self.df_pagar, self.df_receber = separar_titulos(self.titulos)
+            registro['linhas'] = len(self.titulos)
+
+    def consultar_dados(self, start_date, end_date):
+        # Snapshots Parquet (só os meses do intervalo) ou consultas parametrizadas sobre o pool da engine,
+        # compactados uma única vez antes de entrar no cache
+        if self.snapshots:
+            df_pagar, df_receber = carregar_titulos_snapshot(start_date, end_date, self.snapshots)
+        else:
+            df_pagar, df_receber = carregar_titulos(self.engine, start_date, end_date)
+        with etapa('compactar_titulos', linhas=len(df_pagar) + len(df_receber)):
+            return compactar_titulos(df_pagar, df_receber)
+
+    def carregar_resumo(self, start_date, end_date):
+        # Resumo compartilhado entre sessões, como os títulos: reruns só de widgets não consultam o banco
+        with etapa('carregar_resumo') as registro:
+            self.resumo = cache_resumos.obter(start_date, end_date, self.consultar_resumo)
+            registro['linhas'] = len(self.resumo)
+
+    def consultar_resumo(self, start_date, end_date):
+        # Totais diários pré-agregados pelo ETL; sem banco ou sem a tabela de resumo, calcula a partir dos títulos
+        resumo = None if self.engine is None else carregar_resumo(self.engine, start_date, end_date)
+        return resumo_dos_titulos(self.titulos) if resumo is None else resumo
+
+    def calcular_fluxo(self, cenarios=None):
+        # Saldo diário projetado pelo vencimento real, para o cenário base e os cenários informados
+        with etapa('calcular_fluxo') as registro:
+            self.projecao = projetar_saldo(
+                self.df_pagar, self.df_receber, self.saldo_inicial, [CENARIO_BASE] + (cenarios or []),
+                coluna_valor='Vlr_Centavos', escala_valor=0.01,
+            )
+            registro['linhas'] = len(self.projecao['saldos'])
+
+    def mostrar_dados(self):
+        with etapa('mostrar_dados'):
+            self._mostrar_dados()
+
+    def _mostrar_dados(self):
+        # Mesmos indicadores dos relatórios em lote (relatorios.py)
+        indicadores = metricas(self.resumo, self.saldo_inicial, self.projecao)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Total a Receber", f"R$ {indicadores['total_receber']:,.2f}")
+        col2.metric("Total a Pagar", f"R$ {indicadores['total_pagar']:,.2f}")
+        col3.metric("Saldo Final", f"R$ {indicadores['saldo_final']:,.2f}")
+        if self.projecao is not None:
+            primeiro_negativo = indicadores['primeiro_negativo']
+            col4.metric("Saldo Negativo em", "—" if pd.isna(primeiro_negativo) else f"{primeiro_negativo:%d/%m/%Y}")
+        st.write("### Dados de Contas a Pagar")
+        self.mostrar_tabela('A Pagar', 'pagar')
+        st.write("### Dados de Contas a Receber")
+        self.mostrar_tabela('A Receber', 'receber')
+
+    def mostrar_tabela(self, categoria, chave):
+        # Busca, filtros, ordenação e paginação no servidor: só a página visível vai ao navegador
+        tabela = TabelaPaginada(self.titulos, categoria)
+        col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 2, 1])
+        busca = col1.text_input("Buscar contraparte", key=f"{chave}_busca")
+        valor_minimo = col2.number_input("Valor mínimo (R$)", min_value=0.0, value=0.0, step=100.0, key=f"{chave}_minimo")
+        valor_maximo = col3.number_input("Valor máximo (R$, 0 = sem limite)", min_value=0.0, value=0.0, step=100.0, key=f"{chave}_maximo")
+        ordenacao = col4.selectbox("Ordenar por", list(ORDENACOES), key=f"{chave}_ordem")
+        decrescente = col5.checkbox("Decrescente", key=f"{chave}_decrescente")
+
+        with etapa('filtrar_tabela', tabela=chave) as registro:
+            posicoes = tabela.selecionar(busca, valor_minimo or None, valor_maximo or None, ORDENACOES[ordenacao], decrescente)
+            registro['linhas'] = len(posicoes)
+
+        col1, col2, col3 = st.columns([1, 1, 4])
+        tamanho = col1.selectbox("Linhas por página", TAMANHOS_PAGINA, index=1, key=f"{chave}_tamanho")
+        paginas = tabela.paginas(posicoes, tamanho)
+        # Filtros mais restritivos podem deixar a página atual além da última
+        if st.session_state.get(f"{chave}_pagina", 1) > paginas:
+            st.session_state[f"{chave}_pagina"] = paginas
+        numero = col2.number_input("Página", min_value=1, max_value=paginas, value=1, key=f"{chave}_pagina")
+        col3.caption(f"{len(posicoes):,} títulos · página {numero} de {paginas}".replace(',', '.'))
+
+        with etapa('st_dataframe', tabela=chave) as registro:
+            pagina = tabela.pagina(posicoes, numero, tamanho)
+            st.dataframe(pagina, use_container_width=True, hide_index=True)
+            registro['linhas'] = len(pagina)
+
+    def gerar_graficos(self, start_date, end_date, granularidade='semana'):
+        # Figuras montadas a partir do resumo diário e guardadas prontas por intervalo, granularidade
+        # e versão dos dados: voltar a um intervalo já visto não remonta nada
+        with etapa('gerar_graficos', granularidade=granularidade):
+            chave = (start_date, end_date, granularidade, versao_resumo(self.resumo))
+            fig_barras, fig_pizza = cache_figuras.obter(chave, lambda: self._montar_figuras(granularidade))
+            with etapa('st_plotly_chart'):
+                st.plotly_chart(fig_barras, use_container_width=True)
+                st.plotly_chart(fig_pizza, use_container_width=True)
+
+    def _montar_figuras(self, granularidade):
+        with etapa('montar_figuras', linhas=len(self.resumo)):
+            return montar_figuras(self.resumo, granularidade)
+
+    def mostrar_analises(self, start_date, end_date):
+        # Agregações executadas no banco (analises.py): só os totais trafegam, nunca os títulos
+        if self.analises is None:
+            st.info("Análises disponíveis apenas com a fonte de dados no banco.")
+            return
+        with etapa('mostrar_analises'):
+            col1, col2 = st.columns([2, 1])
+            origem = col1.radio("Origem", ['apagar', 'areceber'], horizontal=True, key="analises_origem",
+                                format_func=lambda chave: ORIGENS[chave]['categoria'])
+            limite = col2.number_input("Maiores contrapartes", min_value=1, max_value=100, value=10, key="analises_limite")
+
+            with etapa('consulta_analises', origem=origem):
+                contrapartes = self.analises.totais_por_contraparte(origem, start_date, end_date, limite=limite)
+                mensal = self.analises.totais_por_mes(origem, start_date, end_date)
+                faixas = self.analises.aging(origem)
+
+            col1, col2 = st.columns(2)
+            fig_contrapartes = px.bar(contrapartes, x='Total', y='Contraparte', orientation='h', template='plotly_white')
+            fig_contrapartes.update_yaxes(autorange='reversed')
+            col1.plotly_chart(fig_contrapartes, use_container_width=True)
+            col2.plotly_chart(px.bar(mensal, x='Mes', y='Total', labels={'Mes': 'Mês de vencimento'}, template='plotly_white'), use_container_width=True)
+            st.write("#### Aging pelo vencimento real")
+            st.dataframe(faixas, use_container_width=True, hide_index=True)
+
+    def mostrar_projecao(self):
+        if self.projecao is None or self.projecao['saldos'].empty:
+            return
+        with etapa('mostrar_projecao', linhas=len(self.projecao['saldos'])):
+            fig_saldo = px.line(self.projecao['saldos'], labels={'index': 'Data', 'value': 'Saldo (R$)', 'variable': 'Cenário'}, template='plotly_white')
+            fig_saldo.add_hline(y=0, line_dash='dot', line_color='red')
+            st.plotly_chart(fig_saldo, use_container_width=True)
+            st.dataframe(self.projecao['resumo'])
@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.express as px
+
+from indicadores import por_periodo, totais_por_categoria
+
+# Granularidades do gráfico de barras (nome exibido -> chave de indicadores.PERIODOS)
+GRANULARIDADES = {'Dia': 'dia', 'Semana': 'semana', 'Mês': 'mes'}
+ROTULOS = {'dia': 'Dia', 'semana': 'Semana', 'mes': 'Mês'}
+
+
+def versao_resumo(resumo):
+    """
+    Versão dos dados dos gráficos: hash do conteúdo do resumo diário (dias x categorias, não
+    títulos). Muda quando uma nova carga altera os totais, no banco ou nos snapshots.
+    """
+    return int(pd.util.hash_pandas_object(resumo, index=False).sum())
+
+
+def montar_figuras(resumo, granularidade='semana'):
+    """
+    Monta as figuras de barras (totais por período e categoria) e de pizza (total por categoria).
+    O Plotly recebe só as séries já agregadas: o tamanho das figuras depende do número de
+    períodos, não de títulos.
+    """
+    periodos = por_periodo(resumo, granularidade)
+    totais = totais_por_categoria(resumo).rename_axis('Categoria').reset_index()
+    fig_barras = px.bar(
+        periodos, x='Periodo', y='Vlr_Titulo', color='Categoria', barmode='group', template='plotly_white',
+        labels={'Periodo': ROTULOS[granularidade], 'Vlr_Titulo': 'Valor (R$)'},
+    )
+    fig_pizza = px.pie(totais, names='Categoria', values='Vlr_Titulo', template='plotly_white')
+    return fig_barras, fig_pizza
+
+
+class CacheFiguras:
+    """
+    Figuras prontas por (intervalo, granularidade, versão dos dados), compartilhadas por todas
+    as sessões do processo. Voltar a um intervalo já visto não remonta as figuras; uma nova
+    versão dos dados gera chaves novas, e as antigas saem pelo descarte dos menos usados.
+    As sessões só leem as figuras (o st.plotly_chart serializa uma cópia).
+    """
+
+    def __init__(self, max_entradas=64):
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self._contadores = {'acertos': 0, 'falhas': 0, 'descartados': 0}
+
+    def obter(self, chave, montar):
+        """
+        Retorna as figuras da chave, chamando `montar()` apenas na primeira vez.
+        """
+        with self._lock:
+            if chave in self._entradas:
+                self._contadores['acertos'] += 1
+                self._entradas.move_to_end(chave)
+                return self._entradas[chave]
+            self._contadores['falhas'] += 1
+
+        figuras = montar()
+        with self._lock:
+            self._entradas[chave] = figuras
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self._contadores['descartados'] += 1
+        return figuras
+
+    def estatisticas(self):
+        with self._lock:
+            total = self._contadores['acertos'] + self._contadores['falhas']
+            return {
+                **self._contadores,
+                'taxa_acerto': self._contadores['acertos'] / total if total else 0.0,
+                'entradas': len(self._entradas),
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+# Instância única por processo, compartilhada entre as sessões
+cache_figuras = CacheFiguras()
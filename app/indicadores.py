@@ -0,0 +1,67 @@
+import pandas as pd
+
+from resumos import inicio_mes, inicio_semana
+
+CATEGORIAS = ['A Pagar', 'A Receber']
+
+# Início do período de cada granularidade dos gráficos, a partir das datas diárias do resumo
+PERIODOS = {'dia': lambda datas: datas, 'semana': inicio_semana, 'mes': inicio_mes}
+
+
+def resumo_dos_titulos(titulos, coluna_data='Data_Emissao'):
+    """
+    Calcula os totais diários por categoria a partir dos títulos compactos (titulos.py), no
+    mesmo formato da tabela de resumo (usado quando o resumo do ETL ainda não existe no banco).
+    """
+    periodo = titulos[coluna_data].dt.normalize().rename('Periodo')
+    diario = (
+        titulos.groupby([periodo, 'Categoria'], observed=True)['Vlr_Centavos']
+        .agg(['sum', 'size'])
+        .reset_index()
+    )
+    return pd.DataFrame({
+        'Periodo': diario['Periodo'],
+        'Categoria': diario['Categoria'].astype(str),
+        'Vlr_Titulo': diario['sum'].astype('float64') / 100,
+        'Quantidade': diario['size'],
+    })
+
+
+def totais_por_categoria(resumo):
+    """
+    Total do intervalo por categoria, com zero para categorias sem títulos.
+    """
+    return resumo.groupby('Categoria')['Vlr_Titulo'].sum().reindex(CATEGORIAS, fill_value=0.0)
+
+
+def metricas(resumo, saldo_inicial, projecao=None):
+    """
+    Totais do intervalo, saldo final e primeira data de saldo negativo (cenário base da projeção,
+    NaT sem projeção): os indicadores do topo do dashboard e dos relatórios em lote.
+    """
+    totais = totais_por_categoria(resumo)
+    return {
+        'total_receber': float(totais['A Receber']),
+        'total_pagar': float(totais['A Pagar']),
+        'saldo_final': saldo_inicial + totais['A Receber'] - totais['A Pagar'],
+        'primeiro_negativo': pd.NaT if projecao is None else projecao['resumo']['primeiro_negativo'].iloc[0],
+    }
+
+
+def por_periodo(resumo, granularidade='semana'):
+    """
+    Agrupa os totais diários por dia, semana (início na segunda-feira) ou mês, com as mesmas
+    regras dos resumos do ETL. Vetorizado: o custo depende do número de dias do resumo.
+    """
+    return (
+        resumo.assign(Periodo=PERIODOS[granularidade](resumo['Periodo']))
+        .groupby(['Periodo', 'Categoria'], as_index=False)['Vlr_Titulo']
+        .sum()
+    )
+
+
+def por_semana(resumo):
+    """
+    Agrupa os totais diários por semana (início na segunda-feira).
+    """
+    return por_periodo(resumo, 'semana').rename(columns={'Periodo': 'Semana'})
@@ -0,0 +1,115 @@
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from titulos import exibir, separar_titulos
+
+# Colunas que podem ordenar a tabela (nome exibido -> coluna do DataFrame compacto)
+ORDENACOES = {
+    'Emissão': 'Data_Emissao',
+    'Vencimento': 'Data_Vencimento',
+    'Vencimento real': 'Data_Vencimento_Real',
+    'Valor': 'Vlr_Centavos',
+    'Contraparte': 'Contraparte',
+    'Título': 'No_Titulo',
+}
+TAMANHOS_PAGINA = [25, 50, 100, 250]
+
+# Ordenações completas já calculadas, compartilhadas entre sessões e reruns, por intervalo e
+# versão dos dados em cache (attrs['chave_cache'] de cache_dados.py), categoria, coluna e sentido
+MAX_ORDENACOES = 8
+_ordenacoes = OrderedDict()
+_trava = threading.Lock()
+
+
+class TabelaPaginada:
+    """
+    Tabela dos títulos de uma categoria paginada no servidor, sobre o DataFrame compacto já em
+    cache (titulos.py): busca, filtros e ordenação produzem só as posições das linhas, e apenas a
+    página visível é convertida e enviada ao navegador. O volume enviado não depende do histórico.
+    """
+
+    def __init__(self, titulos, categoria):
+        pagar, receber = separar_titulos(titulos)
+        self.df = pagar if categoria == 'A Pagar' else receber
+        self.categoria = categoria
+        # Títulos fora do cache_titulos (sem versão) são ordenados a cada chamada
+        self.chave_dados = titulos.attrs.get('chave_cache')
+
+    def selecionar(self, busca='', valor_minimo=None, valor_maximo=None, coluna='Data_Emissao', decrescente=False):
+        """
+        Posições das linhas que passam pelos filtros, na ordem pedida. A ordenação completa da
+        coluna é calculada uma vez por DataFrame em cache; cada interação só filtra essa ordem.
+        """
+        ordem = self._ordenacao(coluna, decrescente)
+        return ordem[self.filtrar(busca, valor_minimo, valor_maximo)[ordem]]
+
+    def _ordenacao(self, coluna, decrescente):
+        if self.chave_dados is None:
+            return self.ordenar(np.arange(len(self.df)), coluna, decrescente)
+        chave = (*self.chave_dados, self.categoria, coluna, decrescente)
+        with _trava:
+            if chave in _ordenacoes:
+                _ordenacoes.move_to_end(chave)
+                return _ordenacoes[chave]
+        ordem = self.ordenar(np.arange(len(self.df)), coluna, decrescente)
+        with _trava:
+            _ordenacoes[chave] = ordem
+            while len(_ordenacoes) > MAX_ORDENACOES:
+                _ordenacoes.popitem(last=False)
+        return ordem
+
+    def filtrar(self, busca='', valor_minimo=None, valor_maximo=None):
+        """
+        Máscara das linhas cuja contraparte contém `busca` (sem diferenciar maiúsculas) e cujo
+        valor, em reais, está entre `valor_minimo` e `valor_maximo` (None = sem limite).
+        """
+        filtro = np.ones(len(self.df), dtype=bool)
+        if busca:
+            # A busca percorre só o dicionário de contrapartes; as linhas são marcadas pelo código
+            contrapartes = self.df['Contraparte'].cat
+            encontradas = contrapartes.categories.str.contains(busca, case=False, regex=False)
+            codigos = contrapartes.codes.to_numpy()
+            filtro &= (codigos >= 0) & np.append(encontradas, False)[codigos]
+        centavos = self.df['Vlr_Centavos']
+        if valor_minimo is not None:
+            filtro &= (centavos >= round(valor_minimo * 100)).fillna(False).to_numpy()
+        if valor_maximo is not None:
+            filtro &= (centavos <= round(valor_maximo * 100)).fillna(False).to_numpy()
+        return filtro
+
+    def ordenar(self, posicoes, coluna='Data_Emissao', decrescente=False):
+        """
+        Ordena as posições pela coluna (estável; vazios sempre no fim), mantendo a ordem original nos empates.
+        """
+        valores = self.df[coluna].iloc[posicoes]
+        if isinstance(valores.dtype, pd.CategoricalDtype):
+            # Ordem alfabética a partir do dicionário, sem comparar os textos linha a linha
+            ranking = np.argsort(np.argsort(valores.cat.categories.astype(str)))
+            codigos = valores.cat.codes.to_numpy()
+            vazio = codigos < 0
+            chave = ranking[np.where(vazio, 0, codigos)]
+        else:
+            # Datas, centavos e números como inteiros: ordenação numérica direta no NumPy
+            vazio = valores.isna().to_numpy()
+            chave = valores.to_numpy(dtype='int64', na_value=0) if valores.dtype.kind != 'M' else valores.to_numpy().view('int64')
+        chave = np.where(vazio, 0, chave)
+        ordem = np.argsort(-chave if decrescente else chave, kind='stable')
+        return np.concatenate([posicoes[ordem[~vazio[ordem]]], posicoes[vazio]])
+
+    @staticmethod
+    def paginas(posicoes, tamanho):
+        return max(1, math.ceil(len(posicoes) / tamanho))
+
+    def pagina(self, posicoes, numero=1, tamanho=50):
+        """
+        Linhas da página `numero` (a partir de 1) no formato de exibição.
+        """
+        inicio = (numero - 1) * tamanho
+        pagina = exibir(self.df.iloc[posicoes[inicio:inicio + tamanho]], self.categoria).reset_index(drop=True)
+        # Sem o dicionário inteiro das categorias, que seria serializado junto com a página
+        categoricas = pagina.select_dtypes('category').columns
+        return pagina.assign(**{coluna: pagina[coluna].cat.remove_unused_categories() for coluna in categoricas})
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from conversores import centavos_para_reais
+from indicadores import CATEGORIAS
+
+# Coluna da contraparte em cada origem; no DataFrame compacto as duas viram 'Contraparte'
+CONTRAPARTES = {'A Pagar': 'Fornecedor', 'A Receber': 'Cliente'}
+
+# Textos repetitivos guardados como categorias (um código inteiro por linha e o dicionário de valores)
+COLUNAS_CATEGORIA = ['Tipo', 'Contraparte', 'Loja', 'Natureza']
+COLUNAS_DATA = ['Data_Emissao', 'Data_Vencimento', 'Data_Vencimento_Real']
+
+# Colunas mostradas nas tabelas de cada categoria, como nas consultas originais
+COLUNAS_EXIBICAO = {
+    'A Pagar': ['No_Titulo', 'Parcela', 'Tipo', 'Fornecedor', 'Vlr_Titulo'] + COLUNAS_DATA,
+    'A Receber': ['No_Titulo', 'Parcela', 'Tipo', 'Cliente', 'Loja', 'Natureza', 'Vlr_Titulo'] + COLUNAS_DATA,
+}
+
+
+def _categorias(partes):
+    valores = pd.concat(partes, ignore_index=True)
+    return valores.astype(pd.CategoricalDtype(valores.dropna().unique()))
+
+
+def compactar_titulos(df_pagar, df_receber):
+    """
+    Une os títulos a pagar e a receber em um único DataFrame compacto, montado uma vez na carga:
+
+    - 'Categoria' ('A Pagar'/'A Receber') categórica, com os títulos a pagar primeiro;
+    - tipo, contraparte, loja e natureza categóricas, e o código da loja ('Loja_Id', Int64; as
+      descrições de dim_loja são todas iguais, então é o código que distingue as lojas);
+    - número do título no menor inteiro que comporta os valores (int32 na prática) e parcela Int16;
+    - valor em centavos inteiros ('Vlr_Centavos', Int64), sem arredondamento de ponto flutuante.
+    """
+    partes = [df_pagar, df_receber]
+    tamanhos = [len(df) for df in partes]
+
+    def coluna(nome):
+        return [df[nome] if nome in df else pd.Series(pd.NA, index=df.index, dtype='object') for df in partes]
+
+    titulos = pd.DataFrame({
+        'Categoria': pd.Categorical.from_codes(np.repeat(np.arange(len(CATEGORIAS), dtype='int8'), tamanhos), CATEGORIAS),
+        'No_Titulo': pd.to_numeric(pd.concat(coluna('No_Titulo'), ignore_index=True), downcast='integer'),
+        'Parcela': pd.concat(coluna('Parcela'), ignore_index=True).astype('Int16'),
+        'Tipo': _categorias(coluna('Tipo')),
+        'Contraparte': _categorias([df_pagar[CONTRAPARTES['A Pagar']], df_receber[CONTRAPARTES['A Receber']]]),
+        'Loja': _categorias(coluna('Loja')),
+        'Loja_Id': pd.concat(coluna('Loja_Id'), ignore_index=True).astype('Int64'),
+        'Natureza': _categorias(coluna('Natureza')),
+        'Vlr_Centavos': (pd.concat(coluna('Vlr_Titulo'), ignore_index=True).astype('Float64') * 100).round().astype('Int64'),
+    })
+    for nome in COLUNAS_DATA:
+        titulos[nome] = pd.to_datetime(pd.concat(coluna(nome), ignore_index=True))
+    return titulos
+
+
+def separar_titulos(titulos):
+    """
+    Retorna (pagar, receber) como fatias por posição do DataFrame compacto, sem copiar os dados.
+    Depende de os títulos a pagar virem primeiro, como em compactar_titulos (ordem mantida pelos filtros).
+    """
+    limite = int(np.searchsorted(titulos['Categoria'].cat.codes.to_numpy(), 1))
+    return titulos.iloc[:limite], titulos.iloc[limite:]
+
+
+def valores_em_reais(titulos):
+    return centavos_para_reais(titulos['Vlr_Centavos'])
+
+
+def para_exibicao(titulos, categoria):
+    """
+    Títulos de uma categoria com as colunas e nomes das consultas originais (valor em reais),
+    para tabelas e exportação. Só a coluna de valor é calculada; as demais são as do DataFrame compacto.
+    """
+    pagar, receber = separar_titulos(titulos)
+    return exibir(pagar if categoria == 'A Pagar' else receber, categoria)
+
+
+def exibir(df, categoria):
+    """
+    Converte linhas já selecionadas de uma categoria (ex.: uma página) para o formato de exibição.
+    """
+    return (
+        df.rename(columns={'Contraparte': CONTRAPARTES[categoria]})
+        .assign(Vlr_Titulo=valores_em_reais(df))[COLUNAS_EXIBICAO[categoria]]
+    )
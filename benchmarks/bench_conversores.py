@@ -0,0 +1,84 @@
+"""
+Compara a conversão de valores pt-BR ('R$ 195.584,85') e datas dd/mm/aaaa feita hoje
+(cadeia de str.replace, converter_para_float aplicado valor a valor e to_datetime sem formato)
+com os conversores vetorizados de src/conversores.py.
+
+Uso:
+    python benchmarks/bench_conversores.py
+    python benchmarks/bench_conversores.py --linhas 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from conversores import converter_data, converter_moeda
+
+
+def converter_para_float(valor):
+    # Conversão escalar anterior do FluxoDeCaixa
+    try:
+        valor = valor.replace("R$", "").replace(".", "").replace(",", ".")
+        return float(valor)
+    except (ValueError, AttributeError):
+        return None
+
+
+def cadeia_replace(valores):
+    # Equivalente em pandas ao CAST(REPLACE(REPLACE(...))) do SQL
+    return (
+        valores.str.replace('R$', '', regex=False)
+        .str.replace('.', '', regex=False)
+        .str.replace(',', '.', regex=False)
+        .astype('float64')
+    )
+
+
+def gerar_valores(linhas, seed=42):
+    """
+    Gera valores e datas no formato do export: milhar '.', decimal ',' e parte com 'R$ '.
+    """
+    rng = np.random.default_rng(seed)
+    centavos = rng.integers(100, 100_000_000, linhas)
+    reais = pd.Series(centavos // 100).map('{:,}'.format).str.replace(',', '.', regex=False)
+    valores = reais + ',' + pd.Series(centavos % 100).astype(str).str.zfill(2)
+    valores = valores.where(rng.random(linhas) < 0.8, 'R$ ' + valores)
+    datas = (pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, linhas), unit='D')).strftime('%d/%m/%Y')
+    return valores, pd.Series(datas), centavos
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, nargs='+', default=[1_000_000])
+    args = parser.parse_args()
+
+    for linhas in args.linhas:
+        valores, datas, esperado = gerar_valores(linhas)
+        print(f"\n{linhas} valores")
+
+        tempo_replace, _ = medir(lambda: cadeia_replace(valores))
+        tempo_escalar, _ = medir(lambda: valores.map(converter_para_float))
+        tempo_vetorizado, (centavos, _) = medir(lambda: converter_moeda(valores))
+        exatos = (centavos.to_numpy(dtype='int64') == esperado).all()
+        print(f"  {'cadeia str.replace':<32} {tempo_replace:>8.2f} s")
+        print(f"  {'converter_para_float (map)':<32} {tempo_escalar:>8.2f} s")
+        print(f"  {'converter_moeda':<32} {tempo_vetorizado:>8.2f} s  centavos exatos: {exatos}")
+
+        tempo_sem_formato, _ = medir(lambda: pd.to_datetime(datas, dayfirst=True))
+        tempo_datas, _ = medir(lambda: converter_data(datas))
+        print(f"  {'to_datetime(dayfirst=True)':<32} {tempo_sem_formato:>8.2f} s")
+        print(f"  {'converter_data':<32} {tempo_datas:>8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Mede os gráficos do dashboard (app/graficos.py) para históricos de tamanhos crescentes:
+tempo para montar as figuras a partir do resumo diário, tempo de uma revisita servida pelo
+cache de figuras e tamanho do JSON enviado ao navegador, por granularidade. Como referência,
+o tamanho da pizza montada com os títulos linha a linha (o Plotly recebendo cada título).
+
+Uso:
+    python benchmarks/bench_graficos.py --linhas 10000 100000 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import plotly.express as px
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(RAIZ, 'src'))
+sys.path.append(os.path.join(RAIZ, 'app'))
+from bench_memoria_titulos import como_consulta
+from extract import extract_data
+from gerador_sintetico import gerar_exports
+from graficos import GRANULARIDADES, CacheFiguras, montar_figuras, versao_resumo
+from indicadores import resumo_dos_titulos
+from titulos import compactar_titulos, valores_em_reais
+
+
+def mediana_ms(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000], help='títulos por arquivo')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'granularidade':<14} {'montar (ms)':>12} {'cache (ms)':>11} {'figuras (KB)':>13} {'pizza por título (KB)':>22}")
+    for linhas in args.linhas:
+        with tempfile.TemporaryDirectory() as diretorio:
+            titulos = compactar_titulos(*como_consulta(*extract_data(*gerar_exports(diretorio, linhas))))
+        resumo = resumo_dos_titulos(titulos)
+        por_titulo = px.pie(titulos.assign(Vlr_Titulo=valores_em_reais(titulos)), names='Categoria', values='Vlr_Titulo')
+        pizza_por_titulo = len(por_titulo.to_json()) / 1024
+        cache = CacheFiguras()
+        for nome, granularidade in GRANULARIDADES.items():
+            montar = mediana_ms(lambda: montar_figuras(resumo, granularidade), args.repeticoes)
+            chave = (None, None, granularidade, versao_resumo(resumo))
+            figuras = cache.obter(chave, lambda: montar_figuras(resumo, granularidade))
+            revisita = mediana_ms(lambda: cache.obter((None, None, granularidade, versao_resumo(resumo)), None), args.repeticoes)
+            tamanho = sum(len(figura.to_json()) for figura in figuras) / 1024
+            print(f"{linhas:>10} {nome:<14} {montar:>12.1f} {revisita:>11.2f} {tamanho:>13.1f} {pizza_por_titulo:>22.1f}")
+
+
+if __name__ == '__main__':
+    main()
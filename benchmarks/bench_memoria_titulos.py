@@ -0,0 +1,88 @@
+"""
+Compara a memória dos títulos mantidos por sessão do dashboard: os dois DataFrames das
+consultas (textos como object, como o read_sql devolve no pandas 2, e como str do pandas 3;
+valor float64) e o DataFrame compacto de app/titulos.py (categorias, inteiros e centavos),
+a partir de exports sintéticos (src/gerador_sintetico.py).
+
+Uso:
+    python benchmarks/bench_memoria_titulos.py --linhas 100000 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(RAIZ, 'src'))
+sys.path.append(os.path.join(RAIZ, 'app'))
+from extract import extract_data
+from gerador_sintetico import gerar_exports
+from titulos import compactar_titulos, para_exibicao
+
+# Colunas do CSV no formato devolvido pelas consultas do dashboard (consultas.py)
+COLUNAS_CONSULTA = {
+    'No. Titulo': 'No_Titulo',
+    'Parcela': 'Parcela',
+    'Tipo': 'Tipo',
+    'Vlr.Titulo': 'Vlr_Titulo',
+    'DT Emissao': 'Data_Emissao',
+    'Vencimento': 'Data_Vencimento',
+}
+
+
+def como_consulta(df_apagar, df_areceber):
+    """
+    Títulos no formato das consultas: nomes das contrapartes e descrições como texto.
+    """
+    df_pagar = df_apagar.drop(columns=['Fornecedor']).rename(
+        columns={**COLUNAS_CONSULTA, 'Nome Fornece': 'Fornecedor', 'Vencto Real': 'Data_Vencimento_Real'}
+    )
+    df_receber = df_areceber.drop(columns=['Cliente', 'Loja', 'Natureza']).rename(
+        columns={**COLUNAS_CONSULTA, 'Nome Cliente': 'Cliente', 'Vencto real': 'Data_Vencimento_Real'}
+    )
+    df_receber['Loja'] = 'Descrição Padrão'
+    df_receber['Loja_Id'] = df_areceber['Loja']
+    df_receber['Natureza'] = 'Descrição Padrão'
+    df_receber['No_Titulo'] = df_receber['No_Titulo'].astype('int64')
+    df_pagar['No_Titulo'] = df_pagar['No_Titulo'].astype('int64')
+    return (
+        df_pagar[['No_Titulo', 'Parcela', 'Tipo', 'Fornecedor', 'Vlr_Titulo', 'Data_Emissao', 'Data_Vencimento', 'Data_Vencimento_Real']],
+        df_receber[['No_Titulo', 'Parcela', 'Tipo', 'Cliente', 'Loja', 'Loja_Id', 'Natureza', 'Vlr_Titulo', 'Data_Emissao', 'Data_Vencimento', 'Data_Vencimento_Real']],
+    )
+
+
+def megabytes(*frames):
+    return sum(df.memory_usage(deep=True).sum() for df in frames) / 1024 ** 2
+
+
+def como_object(df):
+    return df.astype({coluna: object for coluna in df.columns if pd.api.types.is_string_dtype(df[coluna].dtype)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, nargs='+', default=[100_000], help='títulos por arquivo')
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'object (MB)':>12} {'str (MB)':>9} {'compacto (MB)':>14} {'redução':>8} {'compactar (s)':>14}")
+    for linhas in args.linhas:
+        with tempfile.TemporaryDirectory() as diretorio:
+            df_pagar, df_receber = como_consulta(*extract_data(*gerar_exports(diretorio, linhas)))
+        inicio = time.perf_counter()
+        titulos = compactar_titulos(df_pagar, df_receber)
+        segundos = time.perf_counter() - inicio
+
+        # Conferência: a visão de exibição reproduz os valores originais
+        exibicao = para_exibicao(titulos, 'A Pagar')
+        assert (exibicao['Vlr_Titulo'].round(2) == df_pagar['Vlr_Titulo'].round(2)).all()
+
+        objetos, textos = megabytes(como_object(df_pagar), como_object(df_receber)), megabytes(df_pagar, df_receber)
+        depois = megabytes(titulos)
+        print(f"{2 * linhas:>10} {objetos:>12.1f} {textos:>9.1f} {depois:>14.1f} {objetos / depois:>7.1f}x {segundos:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Mede cada etapa do pipeline sobre exports sintéticos (src/gerador_sintetico.py):
+extração (extract_data), carga incremental nas tabelas fato, carga dos títulos do dashboard
+(carregar_dados) e sua compactação (titulos.py), projeção do saldo (calcular_fluxo), montagem
+dos gráficos sem cache (gerar_graficos) e totais (mostrar_dados).
+
+Por padrão usa um SQLite temporário; com --db-url, um PostgreSQL de teste. Os resultados são
+gravados em JSON com a versão do código, para comparar execuções com --comparar.
+
+Uso:
+    python benchmarks/bench_pipeline.py --linhas 10000 100000 1000000
+    python benchmarks/bench_pipeline.py --linhas 1000000 --saida novo.json --comparar antigo.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+import pandas as pd
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(RAIZ, 'src'))
+sys.path.append(os.path.join(RAIZ, 'app'))
+from bench_esquema import criar_engine_bench
+from consultas import carregar_resumo, carregar_titulos
+from esquema import aplicar_migracoes
+from extract import _carregar, extract_data
+from gerador_sintetico import gerar_exports
+from graficos import montar_figuras
+from indicadores import totais_por_categoria
+from projecao import CENARIO_BASE, projetar_saldo
+from titulos import compactar_titulos, separar_titulos
+
+# Intervalo consultado pelo dashboard (dois meses dentro do ano gerado)
+INICIO = date(2024, 9, 1)
+FIM = date(2024, 10, 31)
+CENARIOS = [
+    CENARIO_BASE,
+    {'nome': 'Recebimentos +15 dias', 'atraso_receber_dias': 15},
+    {'nome': 'Recebimentos -10%', 'desconto_receber_pct': 10.0},
+]
+
+
+def versao_codigo():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Cronometro:
+    """
+    Registra a duração e a quantidade de linhas de cada etapa.
+    """
+
+    def __init__(self):
+        self.etapas = {}
+
+    def medir(self, nome, funcao, linhas=len):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        segundos = time.perf_counter() - inicio
+        self.etapas[nome] = {'segundos': segundos, 'linhas': linhas(resultado) if linhas else None}
+        print(f"  {nome:<18} {segundos:>9.3f} s")
+        return resultado
+
+
+def executar(linhas, db_url, diretorio):
+    cronometro = Cronometro()
+    apagar_path, areceber_path = cronometro.medir(
+        'gerar_csv', lambda: gerar_exports(os.path.join(diretorio, 'csv'), linhas), linhas=lambda _: 2 * linhas,
+    )
+    df_apagar, df_areceber = cronometro.medir(
+        'extract_data', lambda: extract_data(apagar_path, areceber_path), linhas=lambda r: len(r[0]) + len(r[1]),
+    )
+
+    engine = criar_engine_bench(db_url, diretorio)
+    aplicar_migracoes(engine)
+    cronometro.medir(
+        'carga', lambda: _carregar({'apagar': [df_apagar], 'areceber': [df_areceber]}, engine, 'incremental'),
+        linhas=lambda relatorios: sum(r['inseridos'] + r['atualizados'] for r in relatorios),
+    )
+
+    df_pagar, df_receber = cronometro.medir(
+        'carregar_dados', lambda: carregar_titulos(engine, INICIO, FIM), linhas=lambda r: len(r[0]) + len(r[1]),
+    )
+    titulos = cronometro.medir('compactar_titulos', lambda: compactar_titulos(df_pagar, df_receber))
+    resumo = cronometro.medir('carregar_resumo', lambda: carregar_resumo(engine, INICIO, FIM))
+    cronometro.medir(
+        'calcular_fluxo',
+        lambda: projetar_saldo(*separar_titulos(titulos), 0.0, CENARIOS, coluna_valor='Vlr_Centavos', escala_valor=0.01),
+        linhas=lambda projecao: len(projecao['saldos']),
+    )
+    cronometro.medir('gerar_graficos', lambda: montar_figuras(resumo, 'semana'))
+    cronometro.medir('mostrar_dados', lambda: totais_por_categoria(resumo))
+    engine.dispose()
+    return cronometro.etapas
+
+
+def comparar(atual, anterior):
+    print(f"\n{'linhas':>10} {'etapa':<18} {'anterior (s)':>13} {'atual (s)':>10} {'variação':>9}")
+    for linhas, etapas in atual['execucoes'].items():
+        antigas = anterior['execucoes'].get(linhas, {})
+        for etapa, medida in etapas.items():
+            if etapa not in antigas:
+                continue
+            antes = antigas[etapa]['segundos']
+            variacao = (medida['segundos'] - antes) / antes * 100 if antes else float('nan')
+            print(f"{linhas:>10} {etapa:<18} {antes:>13.3f} {medida['segundos']:>10.3f} {variacao:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db-url', help='URL de um banco vazio de teste (padrão: SQLite temporário)')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000], help='títulos por arquivo')
+    parser.add_argument('--saida', default='bench_pipeline.json')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior para comparação')
+    args = parser.parse_args()
+
+    resultado = {
+        'versao': versao_codigo(),
+        'executado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'banco': 'sqlite' if not args.db_url else args.db_url.split(':', 1)[0],
+        'execucoes': {},
+    }
+    for linhas in args.linhas:
+        print(f"\n{linhas} títulos por arquivo")
+        with tempfile.TemporaryDirectory() as diretorio:
+            resultado['execucoes'][str(linhas)] = executar(linhas, args.db_url, diretorio)
+
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em '{args.saida}'")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            comparar(resultado, json.load(arquivo))
+
+
+if __name__ == '__main__':
+    main()
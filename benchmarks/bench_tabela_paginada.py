@@ -0,0 +1,78 @@
+"""
+Mede a tabela paginada do dashboard (app/tabela_paginada.py) contra o envio da tabela inteira:
+tempo de busca + filtro + ordenação + página no servidor (mediana das interações seguintes à
+primeira, que calcula a ordenação completa) e bytes serializados em Arrow (o formato que o
+st.dataframe envia ao navegador), para históricos de tamanhos crescentes.
+
+Uso:
+    python benchmarks/bench_tabela_paginada.py --linhas 100000 500000 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+import pyarrow as pa
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(RAIZ, 'src'))
+sys.path.append(os.path.join(RAIZ, 'app'))
+from bench_memoria_titulos import como_consulta
+from cache_dados import CacheIntervalos
+from extract import extract_data
+from gerador_sintetico import gerar_exports
+from tabela_paginada import TabelaPaginada
+from titulos import compactar_titulos, para_exibicao
+
+# Interações medidas: (busca, valor mínimo, valor máximo, coluna de ordenação, decrescente)
+CENARIOS = {
+    'sem_filtro': ('', None, None, 'Data_Emissao', False),
+    'busca': ('cliente 0001', None, None, 'Contraparte', False),
+    'faixa_valor': ('', 1_000.0, 50_000.0, 'Vlr_Centavos', True),
+}
+
+
+def bytes_arrow(df):
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    destino = pa.BufferOutputStream()
+    with pa.ipc.new_stream(destino, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return destino.getvalue().size
+
+
+def medir(tabela, cenario, repeticoes, tamanho=50):
+    busca, minimo, maximo, coluna, decrescente = cenario
+    tempos = []
+    tabela.selecionar('', None, None, coluna, decrescente)  # primeira interação: ordenação completa
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        posicoes = tabela.selecionar(busca, minimo, maximo, coluna, decrescente)
+        pagina = tabela.pagina(posicoes, 2, tamanho)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, bytes_arrow(pagina)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, nargs='+', default=[100_000, 500_000], help='títulos por arquivo')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'cenário':<12} {'página (ms)':>12} {'página (KB)':>12} {'tabela inteira (KB)':>20}")
+    for linhas in args.linhas:
+        with tempfile.TemporaryDirectory() as diretorio:
+            titulos = compactar_titulos(*como_consulta(*extract_data(*gerar_exports(diretorio, linhas))))
+        # Como no dashboard, os títulos chegam do cache (com a versão que identifica as ordenações)
+        titulos = CacheIntervalos().obter(date(2024, 1, 1), date(2024, 12, 31), lambda inicio, fim: titulos)
+        tabela = TabelaPaginada(titulos, 'A Receber')
+        inteira = bytes_arrow(para_exibicao(titulos, 'A Receber')) / 1024
+        for nome, cenario in CENARIOS.items():
+            milissegundos, pagina = medir(tabela, cenario, args.repeticoes)
+            print(f"{linhas:>10} {nome:<12} {milissegundos:>12.1f} {pagina / 1024:>12.1f} {inteira:>20.1f}")
+
+
+if __name__ == '__main__':
+    main()
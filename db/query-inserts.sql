@@ -1,5 +1,7 @@
+-- Estrutura (chaves, parcela nula e índices) criada por src/esquema.py:
+--   python src/esquema.py --db-url postgresql://...
 INSERT INTO cashflow_financeiro.dim_fornecedor (FornecedorID, Nome_Fornec)
-SELECT "Fornecedor" , "Nome Fornece"
+SELECT CAST("Fornecedor" AS BIGINT), "Nome Fornece"
 FROM apagar
 ON CONFLICT (FornecedorID) DO NOTHING;
 
@@ -9,6 +11,7 @@ FROM areceber
 ON CONFLICT (ClienteID) DO NOTHING;
 
 --delete do WWFTJ1	1	MB DISTRIBUIDORA
+-- (o ETL já descarta e relata essas linhas antes da staging; mantido para cargas antigas)
 DELETE FROM areceber
 WHERE "Cliente" !~ '^[0-9]+$';
 
@@ -24,29 +27,19 @@ FROM areceber
 ON CONFLICT (naturezaid) DO NOTHING;
 
 ---insert tabela de fato_apagar---
+-- valores e datas já chegam tipados do ETL (extract.py), sem conversão de texto aqui
 INSERT INTO cashflow_financeiro.fato_apagar (no_titulo, parcela, tipo, fornecedoriD, valor, data_emissao, data_vencimento, data_vencimento_real)
 SELECT 
   "No. Titulo", 
   "Parcela", 
   "Tipo", 
-  "Fornecedor", 
-  CAST(REPLACE(REPLACE("Vlr.Titulo", '.', ''), ',', '.') AS DOUBLE PRECISION), 
-  TO_DATE("DT Emissao", 'DD-MM-YYYY'), 
-  TO_DATE("Vencimento", 'DD-MM-YYYY'), 
-  TO_DATE("Vencto Real", 'DD-MM-YYYY')
+  CAST("Fornecedor" AS BIGINT), 
+  "Vlr.Titulo", 
+  CAST("DT Emissao" AS DATE), 
+  CAST("Vencimento" AS DATE), 
+  CAST("Vencto Real" AS DATE)
 FROM apagar;
 
----- permitindo que a coluan parcela tenha valores nulo---
-ALTER TABLE cashflow_financeiro.fato_apagar
-ALTER COLUMN parcela DROP NOT NULL;
----removendo chave primaria de parcela---
-ALTER TABLE cashflow_financeiro.fato_apagar
-DROP CONSTRAINT fato_apagar_pkey;
-
----adicionando outras chaves primarias---
-ALTER TABLE cashflow_financeiro.fato_apagar
-ADD PRIMARY KEY (no_titulo, fornecedoriD, data_vencimento_real);
-
 ---- inserir dados na tabela fato_areceber----
 INSERT INTO cashflow_financeiro.fato_areceber (no_titulo, parcela, tipo, naturezaid, clienteid, lojaid, valor, data_emissao, data_vencimento, data_vencimento_real)
 SELECT 
@@ -55,26 +48,13 @@ SELECT
   "Tipo", 
   "Natureza", 
   CAST("Cliente" AS BIGINT), 
-  NULL, 
-  CAST(REPLACE(REPLACE("Vlr.Titulo", '.', ''), ',', '.') AS DOUBLE PRECISION), 
-  TO_DATE("DT Emissao", 'DD-MM-YYYY'), 
-  TO_DATE("Vencimento", 'DD-MM-YYYY'), 
-  TO_DATE("Vencto real", 'DD-MM-YYYY')
+  CAST("Loja" AS BIGINT), 
+  "Vlr.Titulo", 
+  CAST("DT Emissao" AS DATE), 
+  CAST("Vencimento" AS DATE), 
+  CAST("Vencto real" AS DATE)
 FROM public."areceber"
 ON CONFLICT (no_titulo, parcela) DO NOTHING;
--- inserindo restricao de unicidade--
-ALTER TABLE cashflow_financeiro.fato_areceber
-ADD CONSTRAINT fato_areceber_unique UNIQUE (no_titulo, parcela);
-
---permitir valores nulo na coluna parcelas--
-ALTER TABLE cashflow_financeiro.fato_areceber
-ALTER COLUMN parcela DROP NOT NULL;
----remover chave primaria da coluna parcela---
-ALTER TABLE cashflow_financeiro.fato_areceber
-DROP CONSTRAINT fato_areceber_pkey;
---remover restricoes de nao-nulo--
-ALTER TABLE cashflow_financeiro.fato_areceber
-ALTER COLUMN parcela DROP NOT NULL;
 
 
 INSERT INTO cashflow_financeiro.dim_cliente (ClienteID, Nome_Cliente)
@@ -82,3 +62,22 @@ SELECT CAST("Cliente" AS BIGINT), "Nome Cliente"
 FROM areceber
 ON CONFLICT (ClienteID) DO NOTHING;
 
+-- Os resumos (resumo_fluxo e resumo_contraparte) não refletem as linhas inseridas acima:
+-- são descartados, e o dashboard calcula os totais a partir dos títulos até que sejam
+-- reconstruídos com: python src/resumos.py --db-url postgresql://...
+DROP TABLE IF EXISTS cashflow_financeiro.resumo_fluxo;
+DROP TABLE IF EXISTS cashflow_financeiro.resumo_contraparte;
+
+-- Registra a carga como uma execução do ETL: a versão dos dados (MAX(executado_em)) muda e o
+-- dashboard descarta as análises em cache (src/analises.py). Mesma estrutura de src/extract.py.
+CREATE TABLE IF NOT EXISTS cashflow_financeiro.etl_execucoes (
+  tabela TEXT NOT NULL,
+  executado_em TIMESTAMP NOT NULL,
+  inseridos BIGINT NOT NULL,
+  atualizados BIGINT NOT NULL,
+  inalterados BIGINT NOT NULL
+);
+INSERT INTO cashflow_financeiro.etl_execucoes (tabela, executado_em, inseridos, atualizados, inalterados)
+SELECT 'fato_apagar', now(), (SELECT COUNT(*) FROM apagar), 0, 0
+UNION ALL
+SELECT 'fato_areceber', now(), (SELECT COUNT(*) FROM areceber), 0, 0;
@@ -1,14 +1,17 @@
+-- Versões parametrizadas destas consultas (qualquer período, maiores contrapartes, aging e totais
+-- por mês de vencimento), com cache por versão dos dados: src/analises.py
 --- Qual a previsao de pagamentos para Novembro?--
 SELECT SUM(valor) AS Total_Pagar_Novembro
 FROM cashflow_financeiro.fato_apagar
-WHERE EXTRACT(MONTH FROM data_vencimento) = 11
-AND EXTRACT(YEAR FROM data_vencimento) = EXTRACT(YEAR FROM CURRENT_DATE);
+-- intervalo [início, fim) em vez de EXTRACT: usa o índice de data_vencimento
+WHERE data_vencimento >= DATE_TRUNC('year', CURRENT_DATE) + INTERVAL '10 months'
+AND data_vencimento < DATE_TRUNC('year', CURRENT_DATE) + INTERVAL '11 months';
 
 --- Qual o total a receber em Outubro?---
 SELECT SUM(valor) AS Total_Receber_Outubro
 FROM cashflow_financeiro.fato_areceber
-WHERE EXTRACT(MONTH FROM data_vencimento) = 10
-AND EXTRACT(YEAR FROM data_vencimento) = EXTRACT(YEAR FROM CURRENT_DATE);
+WHERE data_vencimento >= DATE_TRUNC('year', CURRENT_DATE) + INTERVAL '9 months'
+AND data_vencimento < DATE_TRUNC('year', CURRENT_DATE) + INTERVAL '10 months';
 ---Quanto pagamos para cada fornecedor?---
 SELECT f.nome_fornec, SUM(fa.valor) AS Total_Pago
 FROM cashflow_financeiro.fato_apagar fa
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# Conversores vetorizados dos formatos brasileiros, compartilhados pelo ETL e pelo dashboard
+
+# Valor em reais: sinal opcional, milhar com '.' (opcional) e até duas casas decimais após ','
+PADRAO_MOEDA = r'-?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d{1,2})?'
+FORMATO_DATA = '%d/%m/%Y'
+
+
+class ErroConversao(ValueError):
+    """
+    Células que não puderam ser convertidas. `invalidos` é uma Series com os valores
+    originais, indexada pela linha de origem.
+    """
+
+    def __init__(self, coluna, invalidos):
+        self.coluna = coluna
+        self.invalidos = invalidos
+        amostra = ', '.join(f"linha {indice}: {valor!r}" for indice, valor in invalidos.head(5).items())
+        mais = f" (e mais {len(invalidos) - 5})" if len(invalidos) > 5 else ''
+        super().__init__(f"{len(invalidos)} valor(es) inválido(s) em '{coluna}': {amostra}{mais}")
+
+
+def _como_texto(valores):
+    valores = pd.Series(valores) if not isinstance(valores, pd.Series) else valores
+    return valores.astype('string')
+
+
+def _tratar_invalidos(coluna, originais, invalidos, erros):
+    if erros == 'raise' and invalidos.any():
+        raise ErroConversao(coluna, originais[invalidos])
+    return originais[invalidos]
+
+
+def converter_moeda(valores, erros='raise', coluna='valor'):
+    """
+    Converte uma coluna de valores em reais para centavos inteiros (Int64).
+
+    Aceita texto com ou sem 'R$', separador de milhar '.' e decimal ',', e também colunas já
+    numéricas (em reais). Células vazias viram <NA>. Com erros='raise' (padrão) as células
+    inválidas geram ErroConversao com todas elas; com erros='coerce' viram <NA>.
+    Retorna (centavos, invalidos).
+    """
+    serie = pd.Series(valores) if not isinstance(valores, pd.Series) else valores
+    if pd.api.types.is_numeric_dtype(serie):
+        centavos = pd.Series(np.round(serie.astype('float64') * 100), index=serie.index).astype('Int64')
+        return centavos, serie.iloc[0:0]
+
+    texto = _como_texto(serie).str.replace('R$', '', regex=False).str.strip()
+    vazios = texto.isna() | (texto == '')
+    validos = texto.str.fullmatch(PADRAO_MOEDA).fillna(False).astype(bool)
+    invalidos = _tratar_invalidos(coluna, serie, ~validos & ~vazios, erros)
+
+    # Com no máximo duas casas decimais validadas, o arredondamento de reais * 100 devolve
+    # os centavos exatos (o erro do float64 fica muito abaixo de meio centavo até ~10^13)
+    reais = (
+        texto.where(validos)
+        .str.replace('.', '', regex=False)
+        .str.replace(',', '.', regex=False)
+        .astype('Float64')
+    )
+    centavos = (reais * 100).round().astype('Int64')
+    return centavos, invalidos
+
+
+def converter_data(valores, erros='raise', coluna='data'):
+    """
+    Converte uma coluna de datas dd/mm/aaaa para datetime64. Células vazias viram NaT.
+    Com erros='raise' (padrão) as células inválidas geram ErroConversao; com erros='coerce' viram NaT.
+    Retorna (datas, invalidos).
+    """
+    serie = pd.Series(valores) if not isinstance(valores, pd.Series) else valores
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie, serie.iloc[0:0]
+    texto = _como_texto(serie).str.strip()
+    datas = pd.to_datetime(texto, format=FORMATO_DATA, errors='coerce')
+    vazios = texto.isna() | (texto == '')
+    invalidos = _tratar_invalidos(coluna, serie, datas.isna() & ~vazios, erros)
+    return datas, invalidos
+
+
+def centavos_para_reais(centavos):
+    """
+    Converte centavos inteiros para reais (float64), para gravação e exibição.
+    """
+    return centavos.astype('Float64').astype('float64') / 100
+
+
+def moeda_para_float(texto):
+    """
+    Converte um único valor digitado (ex.: 'R$ 195.584,85') para float, ou None se inválido.
+    """
+    centavos, _ = converter_moeda(pd.Series([texto], dtype=object), erros='coerce')
+    if centavos.isna().iloc[0]:
+        return None
+    return int(centavos.iloc[0]) / 100
@@ -0,0 +1,91 @@
+import pandas as pd
+from sqlalchemy import text
+
+from esquema import METADADOS, SCHEMA
+
+# Dimensões alimentadas por cada origem: (tabela, id, coluna do CSV, coluna de descrição, coluna do CSV com a descrição)
+DIMENSOES = {
+    'apagar': [
+        ('dim_fornecedor', 'fornecedorid', 'Fornecedor', 'nome_fornec', 'Nome Fornece'),
+    ],
+    'areceber': [
+        ('dim_cliente', 'clienteid', 'Cliente', 'nome_cliente', 'Nome Cliente'),
+        ('dim_loja', 'lojaid', 'Loja', 'descricao', None),
+        ('dim_natureza', 'naturezaid', 'Natureza', 'descricao', None),
+    ],
+}
+
+# Chaves obrigatórias em cada origem (as demais dimensões aceitam vazio)
+CHAVES_OBRIGATORIAS = {
+    'apagar': ['No. Titulo', 'Fornecedor'],
+    'areceber': ['No. Titulo', 'Cliente'],
+}
+
+DESCRICAO_PADRAO = 'Descrição Padrão'
+
+
+def _inteiros(valores):
+    """
+    Converte a coluna para Int64; valores não inteiros (ex.: 'WWFTJ1', '1.5') viram <NA>.
+    """
+    numeros = pd.to_numeric(valores, errors='coerce')
+    return numeros.where(numeros % 1 == 0).astype('Int64')
+
+
+def validar_chaves(df, origem):
+    """
+    Valida de forma vetorizada as chaves do título e das dimensões da origem.
+    Retorna (validos, rejeitados); `rejeitados` traz as linhas originais e a coluna 'motivo'.
+    """
+    motivos = pd.Series(pd.NA, index=df.index, dtype='string')
+    colunas = ['No. Titulo'] + [dimensao[2] for dimensao in DIMENSOES[origem]]
+    for coluna in colunas:
+        vazio = df[coluna].isna()
+        invalido = ~vazio & _inteiros(df[coluna]).isna()
+        if coluna in CHAVES_OBRIGATORIAS[origem]:
+            motivos = motivos.mask(vazio & motivos.isna(), f"{coluna} vazio")
+        motivos = motivos.mask(invalido & motivos.isna(), f"{coluna} inválido: " + df[coluna].astype('string'))
+    rejeitado = motivos.notna()
+    return df[~rejeitado], df[rejeitado].assign(motivo=motivos[rejeitado])
+
+
+class CacheDimensoes:
+    """
+    Chaves já existentes em cada dimensão, lidas do banco uma única vez por execução do ETL.
+    Cada carga insere, em um só lote por dimensão, apenas as chaves que ainda não estão no cache.
+    """
+
+    def __init__(self):
+        self.chaves = {}
+
+    def _conhecidas(self, conn, tabela, id_dim):
+        if tabela not in self.chaves:
+            existentes = pd.read_sql(text(f"SELECT {id_dim} AS id FROM {SCHEMA}.{tabela}"), conn)
+            self.chaves[tabela] = pd.Index(existentes['id'].astype('int64'))
+        return self.chaves[tabela]
+
+    def registrar(self, conn, df, origem):
+        """
+        Insere nas dimensões as chaves usadas pela origem que ainda não existem.
+        Retorna a quantidade de chaves novas por dimensão.
+        """
+        novas = {}
+        for tabela, id_dim, coluna, descricao, coluna_descricao in DIMENSOES[origem]:
+            chaves = pd.DataFrame({
+                id_dim: _inteiros(df[coluna]),
+                descricao: df[coluna_descricao] if coluna_descricao else DESCRICAO_PADRAO,
+            }).dropna(subset=[id_dim])
+            conhecidas = self._conhecidas(conn, tabela, id_dim)
+            chaves = chaves[~chaves[id_dim].isin(conhecidas)].drop_duplicates(subset=[id_dim])
+            if not chaves.empty:
+                registros = chaves.astype(object).where(chaves.notna(), None).to_dict('records')
+                conn.execute(METADADOS.tables[f'{SCHEMA}.{tabela}'].insert(), registros)
+                self.chaves[tabela] = conhecidas.append(pd.Index(chaves[id_dim].astype('int64')))
+            novas[tabela] = len(chaves)
+        return novas
+
+    def invalidar(self):
+        """
+        Descarta o cache (ex.: após uma transação desfeita); a próxima carga relê as chaves.
+        """
+        self.chaves.clear()
@@ -3,19 +3,20 @@ import pandas as pd
 import plotly.express as px
 from datetime import date
 
+from conversores import moeda_para_float
+from projecao import projetar_saldo
+
 class FluxoDeCaixa:
     def __init__(self):
         self.saldo_inicial = 0.0
         self.df_pagar = pd.DataFrame()
         self.df_receber = pd.DataFrame()
+        self.projecao = None
 
     @staticmethod
     def converter_para_float(valor):
-        try:
-            valor = valor.replace("R$", "").replace(".", "").replace(",", ".")
-            return float(valor)
-        except (ValueError, AttributeError):
-            return None
+        # Mesma conversão pt-BR usada pelo ETL (conversores.py); None se o valor for inválido
+        return moeda_para_float(valor)
 
     def gerar_graficos(self, start_date, end_date):
         self.df_pagar['Categoria'] = 'A Pagar'
@@ -49,6 +50,16 @@ class FluxoDeCaixa:
         self.df_pagar['DT Emissao'] = pd.to_datetime(self.df_pagar['DT Emissao']).dt.date
         self.df_receber['DT Emissao'] = pd.to_datetime(self.df_receber['DT Emissao']).dt.date
 
+        # Saldo diário projetado pelo vencimento real
+        self.projecao = projetar_saldo(
+            self.df_pagar, self.df_receber, self.saldo_inicial,
+            coluna_data='Vencto Real', coluna_valor='Vlr.Titulo'
+        )
+        primeiro_negativo = self.projecao['resumo']['primeiro_negativo'].iloc[0]
+        if not pd.isna(primeiro_negativo):
+            st.warning(f"O saldo fica negativo em {primeiro_negativo:%d/%m/%Y}")
+        st.line_chart(self.projecao['saldos'])
+
     def mostrar_dados(self):
         total_receber = self.df_receber['Vlr.Titulo'].sum()
         total_pagar = self.df_pagar['Vlr.Titulo'].sum()
@@ -81,6 +92,8 @@ class FluxoDeCaixa:
         # Converter para datetime
         self.df_pagar['DT Emissao'] = pd.to_datetime(self.df_pagar['DT Emissao'], dayfirst=True)
         self.df_receber['DT Emissao'] = pd.to_datetime(self.df_receber['DT Emissao'], dayfirst=True)
+        self.df_pagar['Vencto Real'] = pd.to_datetime(self.df_pagar['Vencto Real'], dayfirst=True)
+        self.df_receber['Vencto Real'] = pd.to_datetime(self.df_receber['Vencto Real'], dayfirst=True)
 
 def main():
     st.set_page_config(page_title="Dashboard de Fluxo de Caixa", layout="wide")
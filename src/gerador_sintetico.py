@@ -0,0 +1,132 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Cabeçalhos exatos dos exports (a coluna de vencimento real muda de caixa entre eles)
+CABECALHOS = {
+    'apagar': ['No. Titulo', 'Parcela', 'Tipo', 'Natureza', 'Fornecedor', 'Nome Fornece', 'Vlr.Titulo', 'DT Emissao', 'Vencimento', 'Vencto Real'],
+    'areceber': ['No. Titulo', 'Parcela', 'Tipo', 'Natureza', 'Cliente', 'Loja', 'Nome Cliente', 'Vlr.Titulo', 'DT Emissao', 'Vencimento', 'Vencto real'],
+}
+
+# Distribuições observadas nos exports reais
+NATUREZAS_APAGAR = [303003, 303004, 203023, 202011, 203039, 201006, 203010, 202008, 202013]
+TIPOS = {'apagar': (['NF', 'BOL'], [0.85, 0.15]), 'areceber': (['NF'], [1.0])}
+PRAZOS_DIAS = [21, 28, 30, 35, 42, 45, 56, 60, 90]
+QUANTIDADE_CONTRAPARTES = {'apagar': 7000, 'areceber': 5000}
+LINHAS_POR_LOTE = 500_000
+
+
+def formatar_moeda(centavos):
+    """
+    Formata centavos como no export: milhar '.', decimal ','. Abaixo de R$ 1.000 os zeros
+    finais são omitidos ('525', '973,9'); a partir daí sempre há duas casas ('2.114,00').
+    """
+    centavos = np.asarray(centavos, dtype='int64')
+    inteiro = pd.Series(centavos // 100).map('{:,}'.format).str.replace(',', '.', regex=False)
+    # Frações formatadas uma vez (100 valores possíveis) e indexadas
+    duas_casas = np.array([f',{fracao:02d}' for fracao in range(100)], dtype=object)
+    curta = np.array([f',{fracao:02d}'.rstrip('0').rstrip(',') for fracao in range(100)], dtype=object)
+    fracao = centavos % 100
+    return inteiro + np.where(centavos >= 100_000, duas_casas[fracao], curta[fracao])
+
+
+def _formatar_unicos(valores, formatar):
+    """
+    Aplica `formatar` só aos valores distintos (poucas datas e contrapartes) e expande o resultado.
+    """
+    unicos, posicoes = np.unique(valores, return_inverse=True)
+    return np.asarray(formatar(unicos), dtype=object)[posicoes]
+
+
+def _formatar_datas(datas):
+    return _formatar_unicos(datas, lambda unicos: pd.DatetimeIndex(unicos).strftime('%d/%m/%Y'))
+
+
+def _nomes(prefixo, codigos):
+    return _formatar_unicos(codigos, lambda unicos: [f'{prefixo} {codigo:05d}' for codigo in unicos])
+
+
+def gerar_lote(origem, linhas, primeiro_titulo=1, inicio='2024-01-01', fim='2024-12-31', rng=None, taxa_invalidos=0.0):
+    """
+    Gera `linhas` títulos da origem já formatados como texto do CSV.
+
+    Emissões uniformes entre `inicio` e `fim`, vencimento pelos prazos usuais, vencimento real
+    deslocado para segunda-feira quando cai no fim de semana e valores log-normais.
+    Com `taxa_invalidos` parte das contrapartes recebe códigos não numéricos (ex.: 'WWFTJ1').
+    """
+    rng = rng or np.random.default_rng()
+    dias = (pd.Timestamp(fim) - pd.Timestamp(inicio)).days + 1
+    emissao = np.datetime64(inicio, 'D') + rng.integers(0, dias, linhas).astype('timedelta64[D]')
+    vencimento = emissao + rng.choice(PRAZOS_DIAS, linhas).astype('timedelta64[D]')
+    dia_semana = (vencimento.astype('int64') + 3) % 7  # 0 = segunda-feira
+    vencimento_real = vencimento + np.where(dia_semana >= 5, 7 - dia_semana, 0).astype('timedelta64[D]')
+    centavos = np.maximum(np.round(rng.lognormal(mean=12.0, sigma=1.3, size=linhas)), 1).astype('int64')
+
+    quantidade = QUANTIDADE_CONTRAPARTES[origem]
+    contraparte = rng.integers(1, quantidade + 1, linhas)
+    codigos = contraparte.astype(str).astype(object)
+    if taxa_invalidos:
+        codigos[rng.random(linhas) < taxa_invalidos] = 'WWFTJ1'
+    tipos, pesos = TIPOS[origem]
+
+    colunas = {
+        'No. Titulo': np.arange(primeiro_titulo, primeiro_titulo + linhas),
+        'Parcela': '',
+        'Tipo': rng.choice(tipos, linhas, p=pesos),
+    }
+    if origem == 'apagar':
+        colunas['Natureza'] = rng.choice(NATUREZAS_APAGAR, linhas)
+        colunas['Fornecedor'] = codigos
+        colunas['Nome Fornece'] = _nomes('FORNECEDOR', contraparte)
+    else:
+        colunas['Natureza'] = 101001
+        colunas['Cliente'] = codigos
+        colunas['Loja'] = np.where(rng.random(linhas) < 0.95, 1, rng.integers(2, 11, linhas))
+        colunas['Nome Cliente'] = _nomes('CLIENTE', contraparte)
+    colunas['Vlr.Titulo'] = formatar_moeda(centavos)
+    colunas['DT Emissao'] = _formatar_datas(emissao)
+    colunas['Vencimento'] = _formatar_datas(vencimento)
+    colunas[CABECALHOS[origem][-1]] = _formatar_datas(vencimento_real)
+    return pd.DataFrame(colunas)[CABECALHOS[origem]]
+
+
+def escrever_csv(caminho, origem, linhas, seed=42, chunksize=LINHAS_POR_LOTE, **kwargs):
+    """
+    Grava um export sintético com `linhas` títulos no formato exato dos arquivos reais
+    (BOM, ';', números pt-BR, datas dd/mm/aaaa, Parcela vazia), em lotes de memória constante.
+    """
+    rng = np.random.default_rng(seed)
+    with open(caminho, 'w', encoding='utf-8-sig', newline='') as arquivo:
+        arquivo.write(';'.join(CABECALHOS[origem]) + '\n')
+        for inicio in range(0, linhas, chunksize):
+            lote = gerar_lote(origem, min(chunksize, linhas - inicio), primeiro_titulo=inicio + 1, rng=rng, **kwargs)
+            lote.to_csv(arquivo, sep=';', header=False, index=False, lineterminator='\n')
+    return caminho
+
+
+def gerar_exports(diretorio, linhas, seed=42, **kwargs):
+    """
+    Gera apagar.csv e areceber.csv com `linhas` títulos cada no diretório.
+    Retorna os caminhos (apagar, areceber).
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    return tuple(
+        escrever_csv(os.path.join(diretorio, f'{origem}.csv'), origem, linhas, seed=seed + numero, **kwargs)
+        for numero, origem in enumerate(CABECALHOS)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Gera exports sintéticos de contas a pagar e a receber.')
+    parser.add_argument('--linhas', type=int, default=100_000, help='títulos por arquivo')
+    parser.add_argument('--destino', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dados', 'sinteticos'))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--inicio', default='2024-01-01', help='primeira data de emissão')
+    parser.add_argument('--fim', default='2024-12-31', help='última data de emissão')
+    parser.add_argument('--taxa-invalidos', type=float, default=0.0, help='fração de contrapartes com código inválido')
+    args = parser.parse_args()
+
+    for caminho in gerar_exports(args.destino, args.linhas, seed=args.seed, inicio=args.inicio, fim=args.fim, taxa_invalidos=args.taxa_invalidos):
+        print(f"Arquivo gerado: {caminho}")
@@ -0,0 +1,150 @@
+import contextvars
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# Nível da instrumentação, pela variável INSTRUMENTACAO:
+#   '' ou '0'  desligada (padrão): etapa() devolve um contexto vazio, sem medir nada
+#   'tempo'    duração e linhas de cada etapa
+#   'memoria'  também o pico de memória alocada (tracemalloc deixa o código várias vezes mais lento: só para diagnóstico)
+NIVEIS = ['tempo', 'memoria']
+
+# Com INSTRUMENTACAO_LOG os registros JSON vão para esse arquivo (uma linha por etapa); sem ela, para o stderr
+logger = logging.getLogger('cashflow.instrumentacao')
+
+_nivel = None
+# Lista que recebe os registros do contexto atual (ver coletar()) e etapa em andamento, para o aninhamento
+_coleta = contextvars.ContextVar('coleta', default=None)
+_etapa_atual = contextvars.ContextVar('etapa_atual', default=None)
+
+
+class _EtapaInativa:
+    """
+    Contexto devolvido com a instrumentação desligada: não mede nem registra nada.
+    """
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *excecao):
+        return False
+
+
+_INATIVA = _EtapaInativa()
+
+
+def configurar(nivel=None, destino=None):
+    """
+    Define o nível da instrumentação (padrão: variável INSTRUMENTACAO) e o destino do log JSON
+    (padrão: variável INSTRUMENTACAO_LOG ou stderr).
+    """
+    global _nivel
+    nivel = os.getenv('INSTRUMENTACAO', '') if nivel is None else nivel
+    nivel = 'tempo' if nivel == '1' else nivel
+    if nivel not in NIVEIS:
+        _nivel = None
+        return
+    _nivel = nivel
+    if not logger.handlers:
+        destino = destino or os.getenv('INSTRUMENTACAO_LOG')
+        handler = logging.FileHandler(destino, encoding='utf-8') if destino else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    if nivel == 'memoria' and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def ativa():
+    return _nivel is not None
+
+
+def etapa(nome, **contexto):
+    """
+    Mede um trecho do pipeline:
+
+        with etapa('carregar_dados', origem='apagar') as registro:
+            df = ...
+            registro['linhas'] = len(df)
+
+    Registra a duração, as linhas informadas, o pico de memória (nível 'memoria'), a etapa
+    em que está aninhada e os campos de `contexto`. Desligada, não custa mais que um `with`.
+    """
+    if _nivel is None:
+        return _INATIVA
+    return _medir(nome, contexto)
+
+
+@contextmanager
+def _medir(nome, contexto):
+    pai = _etapa_atual.get()
+    registro = {'etapa': nome, 'pai': pai['etapa'] if pai else None, 'inicio': datetime.now().isoformat(timespec='microseconds')}
+    registro.update(contexto)
+    memoria = _nivel == 'memoria' and tracemalloc.is_tracing()
+    if memoria:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    token = _etapa_atual.set(registro)
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    except BaseException as e:
+        registro['erro'] = type(e).__name__
+        raise
+    finally:
+        registro['segundos'] = round(time.perf_counter() - inicio, 6)
+        _etapa_atual.reset(token)
+        if memoria:
+            # reset_peak() das etapas internas apaga o pico desta: o maior pico delas é repassado
+            pico = max(tracemalloc.get_traced_memory()[1], registro.pop('_pico', 0))
+            registro['pico_mb'] = round((pico - base) / 1024 ** 2, 3)
+            if pai is not None:
+                pai['_pico'] = max(pai.get('_pico', 0), pico)
+        _registrar(registro)
+
+
+def _registrar(registro):
+    logger.info(json.dumps(registro, default=str, ensure_ascii=False))
+    coleta = _coleta.get()
+    if coleta is not None:
+        coleta.append(registro)
+
+
+@contextmanager
+def coletar():
+    """
+    Acumula em uma lista os registros das etapas executadas dentro do bloco (ex.: um rerun
+    do dashboard), inclusive em threads iniciadas com contextvars.copy_context().
+    """
+    registros = []
+    token = _coleta.set(registros)
+    try:
+        yield registros
+    finally:
+        _coleta.reset(token)
+
+
+def resumir(registros):
+    """
+    Texto com uma linha por etapa (indentada pelo aninhamento), na ordem em que começaram.
+    """
+    profundidade = {}
+    linhas = []
+    for registro in sorted(registros, key=lambda r: r['inicio']):
+        nivel = profundidade.get(registro['pai'], -1) + 1
+        profundidade[registro['etapa']] = nivel
+        texto = f"{'  ' * nivel}{registro['etapa']:<{32 - 2 * nivel}} {registro['segundos']:>9.3f} s"
+        if registro.get('linhas') is not None:
+            texto += f" {registro['linhas']:>10} linhas"
+        if 'pico_mb' in registro:
+            texto += f" {registro['pico_mb']:>9.1f} MB"
+        linhas.append(texto)
+    return '\n'.join(linhas)
+
+
+configurar()
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+# Cenário sem ajustes: títulos recebidos e pagos no vencimento real, pelo valor integral
+CENARIO_BASE = {'nome': 'Base', 'atraso_receber_dias': 0, 'desconto_receber_pct': 0.0, 'atraso_pagar_dias': 0}
+
+
+def cenarios_simulacao(atraso_dias, perda_pct):
+    """
+    Cenários simulados pelo dashboard e pelos relatórios em lote: atraso nos recebimentos,
+    perda nos recebimentos e os dois juntos.
+    """
+    return [
+        {'nome': f'Recebimentos +{atraso_dias} dias', 'atraso_receber_dias': atraso_dias},
+        {'nome': f'Recebimentos -{perda_pct:g}%', 'desconto_receber_pct': perda_pct},
+        {'nome': 'Atraso e perda', 'atraso_receber_dias': atraso_dias, 'desconto_receber_pct': perda_pct},
+    ]
+
+
+def _fluxo_diario(datas, valores):
+    """
+    Soma os valores por data. Retorna a primeira data (datetime64[D]) e o vetor diário denso.
+    """
+    datas = pd.to_datetime(datas).to_numpy(dtype='datetime64[D]')
+    valores = np.asarray(valores, dtype='float64')
+    validos = ~np.isnat(datas) & ~np.isnan(valores)
+    datas, valores = datas[validos], valores[validos]
+    if datas.size == 0:
+        return None, np.zeros(0)
+    inicio = datas.min()
+    return inicio, np.bincount((datas - inicio).astype('int64'), weights=valores)
+
+
+def _posicionar(matriz, sinal, inicio_fluxo, fluxo, inicio_indice, deslocamentos, fatores):
+    """
+    Soma na matriz (cenários x dias) o fluxo diário deslocado e escalado de cada cenário.
+    """
+    if fluxo.size == 0:
+        return
+    colunas = (inicio_fluxo - inicio_indice).astype('int64') + np.arange(fluxo.size)[None, :] + deslocamentos[:, None]
+    linhas = np.arange(len(deslocamentos))[:, None]
+    matriz[linhas, colunas] += sinal * fluxo[None, :] * fatores[:, None]
+
+
+def projetar_saldo(df_pagar, df_receber, saldo_inicial, cenarios=None,
+                   coluna_data='Data_Vencimento_Real', coluna_valor='Vlr_Titulo', escala_valor=1.0):
+    """
+    Projeta o saldo diário a partir do saldo inicial, lançando cada título na sua data de
+    vencimento real, para vários cenários em uma única passada vetorizada.
+
+    Cada cenário é um dicionário com 'nome', 'atraso_receber_dias', 'desconto_receber_pct'
+    e 'atraso_pagar_dias' (chaves ausentes valem zero). Os títulos são somados por dia uma
+    única vez; cada cenário apenas desloca e escala esses vetores diários, então o custo é
+    O(títulos + cenários x dias). `escala_valor` converte a coluna de valor para reais
+    (ex.: 0.01 para 'Vlr_Centavos').
+
+    Retorna um dicionário com:
+    - 'saldos': DataFrame com o saldo ao fim de cada dia (índice) por cenário (colunas);
+    - 'resumo': DataFrame por cenário com saldo final, menor saldo e a data em que o saldo
+      fica negativo pela primeira vez (NaT se nunca fica).
+    """
+    cenarios = cenarios or [CENARIO_BASE]
+    nomes = [cenario.get('nome', f'Cenário {i + 1}') for i, cenario in enumerate(cenarios)]
+    atraso_receber = np.array([int(c.get('atraso_receber_dias', 0)) for c in cenarios], dtype='int64')
+    atraso_pagar = np.array([int(c.get('atraso_pagar_dias', 0)) for c in cenarios], dtype='int64')
+    fator_receber = np.array([1 - c.get('desconto_receber_pct', 0.0) / 100 for c in cenarios])
+
+    inicio_receber, fluxo_receber = _fluxo_diario(df_receber[coluna_data], df_receber[coluna_valor])
+    inicio_pagar, fluxo_pagar = _fluxo_diario(df_pagar[coluna_data], df_pagar[coluna_valor])
+    fluxo_receber, fluxo_pagar = fluxo_receber * escala_valor, fluxo_pagar * escala_valor
+
+    # Índice denso de datas cobrindo todos os deslocamentos dos cenários
+    limites = []
+    if inicio_receber is not None:
+        limites += [inicio_receber + atraso_receber.min(), inicio_receber + fluxo_receber.size - 1 + atraso_receber.max()]
+    if inicio_pagar is not None:
+        limites += [inicio_pagar + atraso_pagar.min(), inicio_pagar + fluxo_pagar.size - 1 + atraso_pagar.max()]
+    if not limites:
+        saldos = pd.DataFrame(columns=nomes, dtype='float64')
+        resumo = pd.DataFrame({
+            'cenario': nomes,
+            'saldo_final': float(saldo_inicial),
+            'menor_saldo': float(saldo_inicial),
+            'data_menor_saldo': pd.NaT,
+            'primeiro_negativo': pd.NaT,
+        })
+        return {'saldos': saldos, 'resumo': resumo}
+    inicio, fim = min(limites), max(limites)
+    dias = int((fim - inicio).astype('int64')) + 1
+
+    fluxo = np.zeros((len(cenarios), dias))
+    if inicio_receber is not None:
+        _posicionar(fluxo, 1.0, inicio_receber, fluxo_receber, inicio, atraso_receber, fator_receber)
+    if inicio_pagar is not None:
+        _posicionar(fluxo, -1.0, inicio_pagar, fluxo_pagar, inicio, atraso_pagar, np.ones(len(cenarios)))
+    saldo = saldo_inicial + np.cumsum(fluxo, axis=1)
+
+    indice = pd.date_range(pd.Timestamp(inicio), periods=dias, freq='D')
+    negativo = saldo < 0
+    primeiro_negativo = np.where(negativo.any(axis=1), indice.values[negativo.argmax(axis=1)], np.datetime64('NaT'))
+    posicao_menor = saldo.argmin(axis=1)
+    resumo = pd.DataFrame({
+        'cenario': nomes,
+        'saldo_final': saldo[:, -1],
+        'menor_saldo': saldo[np.arange(len(cenarios)), posicao_menor],
+        'data_menor_saldo': indice.values[posicao_menor],
+        'primeiro_negativo': pd.to_datetime(primeiro_negativo),
+    })
+    return {'saldos': pd.DataFrame(saldo.T, index=indice, columns=nomes), 'resumo': resumo}
@@ -10,12 +10,21 @@ print("Generated key:", key)
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import date
-from sqlalchemy import create_engine
 import os
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from cache_dados import cache_titulos
+from consultas import carregar_titulos, criar_engine
+from conversores import moeda_para_float
+from graficos import montar_figuras
+from indicadores import resumo_dos_titulos
+from tabela_paginada import TabelaPaginada
+from titulos import compactar_titulos, separar_titulos, valores_em_reais
+
 # Carregar variáveis do arquivo .env
 load_dotenv()
 
@@ -26,83 +35,39 @@ host = os.getenv("DB_HOST")
 porta = os.getenv("DB_PORT")
 db = os.getenv("DB_NAME")
 
-# Crie a engine de conexão usando as variáveis de ambiente
-engine = create_engine(f'postgresql+psycopg2://{usuario}:{senha}@{host}:{porta}/{db}', connect_args={"options": "-c client_encoding=utf8"})
+# Crie a engine de conexão usando as variáveis de ambiente, com pool de tamanho explícito
+engine = criar_engine(
+    f'postgresql+psycopg2://{usuario}:{senha}@{host}:{porta}/{db}',
+    pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 5)),
+    connect_args={"options": "-c client_encoding=utf8"},
+)
 
 class FluxoDeCaixa:
     def __init__(self, engine):
         self.saldo_inicial = 0.0
+        self.titulos = pd.DataFrame()
         self.df_pagar = pd.DataFrame()
         self.df_receber = pd.DataFrame()
         self.engine = engine
 
     @staticmethod
     def converter_para_float(valor):
-        try:
-            valor = valor.replace("R$", "").replace(".", "").replace(",", ".")
-            return float(valor)
-        except (ValueError, AttributeError):
-            return None
+        # Mesma conversão pt-BR usada pelo ETL (conversores.py); None se o valor for inválido
+        return moeda_para_float(valor)
 
     def carregar_dados(self, start_date, end_date):
-        query_pagar = f"""
-        SELECT 
-            f.no_titulo AS "No_Titulo", 
-            f.parcela AS "Parcela", 
-            f.tipo AS "Tipo", 
-            d.nome_fornec AS "Fornecedor", 
-            f.valor AS "Vlr_Titulo", 
-            f.data_emissao::date AS "Data_Emissao", 
-            f.data_vencimento AS "Data_Vencimento", 
-            f.data_vencimento_real AS "Data_Vencimento_Real"
-        FROM 
-            cashflow_financeiro.fato_apagar AS f
-        LEFT JOIN 
-            cashflow_financeiro.dim_fornecedor AS d 
-        ON 
-            f.fornecedorID = d.fornecedorID
-        WHERE 
-            f.data_emissao BETWEEN '{start_date}' AND '{end_date}'
-        """
-        query_receber = f"""
-        SELECT 
-            f.no_titulo AS "No_Titulo", 
-            f.parcela AS "Parcela", 
-            f.tipo AS "Tipo", 
-            c.nome_cliente AS "Cliente", 
-            l.descricao AS "Loja", 
-            n.descricao AS "Natureza", 
-            f.valor AS "Vlr_Titulo", 
-            f.data_emissao::date AS "Data_Emissao", 
-            f.data_vencimento AS "Data_Vencimento", 
-            f.data_vencimento_real AS "Data_Vencimento_Real"
-        FROM 
-            cashflow_financeiro.fato_areceber AS f
-        LEFT JOIN 
-            cashflow_financeiro.dim_cliente AS c 
-        ON 
-            f.clienteID = c.clienteID
-        LEFT JOIN 
-            cashflow_financeiro.dim_loja AS l 
-        ON 
-            f.lojaid = l.lojaid
-        LEFT JOIN 
-            cashflow_financeiro.dim_natureza AS n 
-        ON 
-            f.naturezaID = n.naturezaID
-        WHERE 
-            f.data_emissao BETWEEN '{start_date}' AND '{end_date}'
-        """
-        self.df_pagar = pd.read_sql(query_pagar, self.engine)
-        self.df_receber = pd.read_sql(query_receber, self.engine)
-
-        # Garantir que as colunas de data são datetime
-        self.df_pagar['Data_Emissao'] = pd.to_datetime(self.df_pagar['Data_Emissao'], errors='coerce')
-        self.df_receber['Data_Emissao'] = pd.to_datetime(self.df_receber['Data_Emissao'], errors='coerce')
+        # Dados compartilhados entre sessões; só consulta o banco se o intervalo não estiver em cache
+        self.titulos = cache_titulos.obter(start_date, end_date, self.consultar_dados)
+        self.df_pagar, self.df_receber = separar_titulos(self.titulos)
+
+    def consultar_dados(self, start_date, end_date):
+        # Consultas parametrizadas (pagar e receber em paralelo) sobre o pool da engine, compactadas uma vez
+        return compactar_titulos(*carregar_titulos(self.engine, start_date, end_date))
 
     def mostrar_dados(self):
-        total_receber = self.df_receber['Vlr_Titulo'].sum()
-        total_pagar = self.df_pagar['Vlr_Titulo'].sum()
+        total_receber = valores_em_reais(self.df_receber).sum()
+        total_pagar = valores_em_reais(self.df_pagar).sum()
         saldo_final = self.saldo_inicial + total_receber - total_pagar
         col1, col2, col3 = st.columns(3)
         col1.metric("Total a Receber", f"R$ {total_receber:,.2f}")
@@ -110,47 +75,23 @@ class FluxoDeCaixa:
         col3.metric("Saldo Final", f"R$ {saldo_final:,.2f}")
 
         st.write("### Dados de Contas a Pagar")
-        st.dataframe(self.df_pagar)
+        self.mostrar_tabela('A Pagar', 'pagar')
 
         st.write("### Dados de Contas a Receber")
-        st.dataframe(self.df_receber)
-
-    def gerar_graficos(self, start_date, end_date):
-        start_date = pd.to_datetime(start_date)
-        end_date = pd.to_datetime(end_date)
-
-        # Ajustar e combinar DataFrames para gráficos
-        self.df_pagar['Categoria'] = 'A Pagar'
-        self.df_receber['Categoria'] = 'A Receber'
-        df_combined = pd.concat([self.df_pagar, self.df_receber], ignore_index=True)
-
-        df_combined = df_combined[(df_combined['Data_Emissao'] >= start_date) & (df_combined['Data_Emissao'] <= end_date)]
-        df_combined = df_combined.dropna(subset=['Data_Emissao'])
-
-        df_combined['Semana'] = df_combined['Data_Emissao'].dt.to_period('W').apply(lambda r: r.start_time)
-        df_grouped = df_combined.groupby(['Semana', 'Categoria']).agg({'Vlr_Titulo': 'sum'}).reset_index()
-
-        # Gráfico de barras
-        fig_barras = px.bar(
-            df_grouped,
-            x='Semana',
-            y='Vlr_Titulo',
-            color='Categoria',
-            barmode='group',
-            title="Valores a Receber e a Pagar por Semana",
-            labels={'Vlr_Titulo': 'Valor (R$)', 'Semana': 'Semana', 'Categoria': 'Categoria'},
-            template='plotly_white'
-        )
+        self.mostrar_tabela('A Receber', 'receber')
 
+    def mostrar_tabela(self, categoria, chave, tamanho=50):
+        # Paginação no servidor (tabela_paginada.py): só a página visível vai ao navegador
+        tabela = TabelaPaginada(self.titulos, categoria)
+        posicoes = tabela.selecionar()
+        numero = st.number_input("Página", min_value=1, max_value=tabela.paginas(posicoes, tamanho), value=1, key=f"{chave}_pagina")
+        st.dataframe(tabela.pagina(posicoes, numero, tamanho), use_container_width=True)
 
-        # Gráfico de pizza
-        fig_pizza = px.pie(
-            df_combined,
-            names='Categoria',
-            values='Vlr_Titulo',
-            title="Distribuição de Valores a Receber e a Pagar",
-            template='plotly_white'
-        )
+    def gerar_graficos(self, start_date, end_date):
+        # Mesmas figuras do dashboard (graficos.py), a partir dos totais diários dos títulos do intervalo
+        fig_barras, fig_pizza = montar_figuras(resumo_dos_titulos(self.titulos), 'semana')
+        fig_barras.update_layout(title="Valores a Receber e a Pagar por Semana")
+        fig_pizza.update_layout(title="Distribuição de Valores a Receber e a Pagar")
 
         # Exibição dos gráficos
         st.plotly_chart(fig_barras, use_container_width=True)
@@ -184,6 +125,10 @@ def main():
 
         fluxo_caixa.carregar_dados(start_date, end_date)
 
+        # Estatísticas do cache compartilhado, para dimensionamento
+        with st.sidebar.expander("Cache de dados"):
+            st.json(cache_titulos.estatisticas())
+
         with st.container():
             st.markdown("## Visão Geral")
             fluxo_caixa.mostrar_dados()